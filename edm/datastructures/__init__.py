@@ -1 +1,6 @@
-from .data_structures import get_bags_of_words, count_labels, filter_top_words
+from .data_structures import get_bags_of_words, count_labels, filter_top_words, tokenize_sentence, STOPWORDS
+
+from .data_structures import encode_labels, count_label_codes
+from .sketches import QuantileSketch, SentenceLengthStatistics
+from .corpus_index import CorpusIndex, build_line_offset_index
+from .pipeline import get_bags_of_words_from_file
\ No newline at end of file
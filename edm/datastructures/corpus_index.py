@@ -0,0 +1,451 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import io
+import os
+import csv
+import sys
+import json
+import mmap
+csv.field_size_limit(sys.maxsize)  # Needed to load datasets with very long items
+
+# >>>> Package Imports <<<<
+import numpy as np
+
+# >>>> This Package Imports <<<<
+# None
+
+# ======================================================================================================================
+
+NEWLINE   = ord("\n")
+RETURN    = ord("\r")
+QUOTE     = ord('"')
+DELIMITER = ord(",")
+
+# The states of the CSV quote scanner: outside a quoted field, inside one, or just after the quote which closed one
+OUTSIDE_QUOTES, INSIDE_QUOTES, AFTER_QUOTES = 0, 1, 2
+
+# The number of bytes scanned at once while building an index
+SCAN_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def _get_file_format(path, fmt):
+    """
+    Gets the format of a corpus file, "csv" or "jsonl", from its extension unless one is given.
+    """
+    if fmt is None:
+        fmt = "jsonl" if os.path.splitext(path)[1].lower() in (".jsonl", ".json", ".ndjson") else "csv"
+
+    assert fmt in ("csv", "jsonl"), "The format must be csv or jsonl"
+
+    return fmt
+
+
+def find_csv_record_ends(data, quoteState=OUTSIDE_QUOTES, previousByte=NEWLINE):
+    """
+    Finds the positions of the newlines which end a record in a block of CSV bytes, i.e. the newlines outside quoted
+    fields. As in csv.reader, a quote only opens a quoted field at the start of a field, and two quotes in a row inside
+    a quoted field are an escaped quote. Any other quote outside a quoted field is part of the text, so quotes cannot
+    simply be counted.
+
+    Whether each quote leaves the scanner inside a quoted field follows from the quotes before it: a quote at the start
+    of a field flips it, a quote straight after another quote repeats the value of the quote before that one, and any
+    other quote clears it. So within a run of quotes in a row the values alternate, and each run as a whole flips,
+    clears or keeps the value before it, which lets every value be found with cumulative sums rather than a loop.
+
+    :param data         : a block of bytes of the file.
+    :type data          : numpy.ndarray
+
+    :param quoteState   : the state of the scanner before the block, default OUTSIDE_QUOTES (the start of the file).
+    :type quoteState    : int
+
+    :param previousByte : the byte before the block, default a newline (the start of the file).
+    :type previousByte  : int
+
+    :return             : the positions of the newlines which end a record and the state of the scanner after the
+                          block.
+    """
+    newlines = np.flatnonzero(data == NEWLINE)
+    quotes   = np.flatnonzero(data == QUOTE)
+
+    # Whether the scanner was inside a quoted field after the last quote and the one before it
+    wasInside, wasInsideBefore = quoteState == INSIDE_QUOTES, quoteState == AFTER_QUOTES
+
+    if quotes.size == 0:
+        return (newlines[:0] if wasInside else newlines), quoteState
+
+    before       = np.where(quotes > 0, data[quotes - 1], previousByte)
+    isFieldStart = (before == DELIMITER) | (before == NEWLINE)
+
+    # Split the quotes into runs of quotes in a row. The first run may carry on a run from before the block
+    runStarts      = np.flatnonzero(np.append(True, before[1:] != QUOTE))
+    runLengths     = np.diff(np.append(runStarts, quotes.size))
+    isContinuation = np.arange(runStarts.size) == 0 if before[0] == QUOTE else np.zeros(runStarts.size, dtype=bool)
+    isOdd          = runLengths % 2 == 1
+
+    # An odd run flips the value at its end if it starts a field, and clears it otherwise. An even run keeps it
+    isFlip  = isOdd & isFieldStart[runStarts] & ~isContinuation
+    isClear = isOdd & ~isFieldStart[runStarts] & ~isContinuation
+
+    # A run carrying on from before the block sets the value to what it would have been outside the block
+    setValues = np.where(isContinuation, np.where(isOdd, wasInsideBefore, wasInside), False)
+    isSet     = isClear | isContinuation
+
+    lastSets  = np.maximum.accumulate(np.where(isSet, np.arange(runStarts.size), -1))
+    numFlips  = np.cumsum(isFlip)
+    runEnds   = np.where(lastSets >= 0, setValues[lastSets], wasInside) ^ \
+        ((numFlips - np.where(lastSets >= 0, numFlips[lastSets], 0)) % 2 == 1)
+
+    # Each run alternates between the value of its first quote and the value before it
+    runInputs = np.append(wasInside, runEnds[:-1])
+    runFirsts = np.where(isContinuation, wasInsideBefore, isFieldStart[runStarts] & ~runInputs)
+
+    # A newline is inside a quoted field if the last quote before it left the scanner inside one, and the state after
+    # the block follows from the last two quotes
+    lastQuotes = np.searchsorted(quotes, newlines) - 1
+    quoteIdxs  = np.append(np.maximum(lastQuotes, 0), [max(quotes.size - 2, 0), quotes.size - 1])
+    runs       = np.searchsorted(runStarts, quoteIdxs, side="right") - 1
+    areInside  = np.where((quoteIdxs - runStarts[runs]) % 2 == 0, runFirsts[runs], runInputs[runs])
+
+    isInside           = np.where(lastQuotes >= 0, areInside[:-2], wasInside)
+    isLastButOneInside = areInside[-2] if quotes.size > 1 else wasInside
+    isLastInside       = areInside[-1]
+
+    quoteState = INSIDE_QUOTES if isLastInside else AFTER_QUOTES if isLastButOneInside else OUTSIDE_QUOTES
+
+    return newlines[~isInside], quoteState
+
+
+def find_record_offsets(data, fmt="csv", hasHeader=False):
+    """
+    Finds the byte offset of the start of every record in the contents of a CSV or JSONL file, in one vectorized pass.
+    In a CSV file, newlines inside quoted fields do not end a record (see find_csv_record_ends). Blank lines are not
+    records.
+
+    :param data      : the contents of the file as an array of bytes, e.g. a NumPy view of a memory map.
+    :type data       : numpy.ndarray
+
+    :param fmt       : the format of the file, "csv" or "jsonl", default "csv".
+    :type fmt        : str
+
+    :param hasHeader : whether the first record is a header which should be skipped, default False.
+    :type hasHeader  : bool
+
+    :return          : an array with the offset of the start of every record, followed by the size of the data, so
+                       record i is data[offsets[i]:offsets[i + 1]].
+    """
+    recordEnds = []
+    quoteState = OUTSIDE_QUOTES
+
+    for chunkStart in range(0, data.size, SCAN_CHUNK_SIZE):
+
+        chunk = data[chunkStart:chunkStart + SCAN_CHUNK_SIZE]
+
+        if fmt == "csv":
+            previousByte         = data[chunkStart - 1] if chunkStart > 0 else NEWLINE
+            newlines, quoteState = find_csv_record_ends(chunk, quoteState, previousByte)
+        else:
+            newlines = np.flatnonzero(chunk == NEWLINE)
+
+        recordEnds.append(newlines + chunkStart)
+
+    starts = np.concatenate([[0], np.concatenate(recordEnds) + 1]).astype(np.uint64)
+    starts = starts[starts < data.size]
+
+    # Blank lines are skipped, their bytes become part of the previous record
+    starts = starts[(data[starts] != NEWLINE) & (data[starts] != RETURN)]
+
+    if hasHeader:
+        starts = starts[1:]
+
+    return np.append(starts, np.uint64(data.size))
+
+
+def build_line_offset_index(path, fmt=None, hasHeader=False):
+    """
+    Builds an index of the byte offsets of the records in a CSV or JSONL corpus file in one pass over the file.
+
+    :param path      : the path of the corpus file.
+    :type path       : str
+
+    :param fmt       : the format of the file, "csv" or "jsonl". By default it is taken from the file extension.
+    :type fmt        : str
+
+    :param hasHeader : whether the first record is a header which should be skipped, default False.
+    :type hasHeader  : bool
+
+    :return          : an array of record offsets, see find_record_offsets.
+    """
+    fmt = _get_file_format(path, fmt)
+
+    with open(path, "rb") as f:
+
+        assert os.fstat(f.fileno()).st_size > 0, "The corpus file is empty"
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+
+            data    = np.frombuffer(mm, dtype=np.uint8)
+            offsets = find_record_offsets(data, fmt, hasHeader)
+
+            # The view must be released before the memory map can be closed
+            del data
+
+    return offsets
+
+
+def parse_records(text, fmt="csv", textField=0, labelField=1):
+    """
+    Parses the text of one or more consecutive records into sentences and labels.
+
+    :param text       : the decoded text of the records.
+    :type text        : str
+
+    :param fmt        : the format of the records, "csv" or "jsonl", default "csv".
+    :type fmt         : str
+
+    :param textField  : the column index (CSV) or key (JSONL) of the text of each item, default 0.
+    :type textField   : int or str
+
+    :param labelField : the column index (CSV) or key (JSONL) of the label of each item, default 1.
+    :type labelField  : int or str
+
+    :return           : a list of sentences and a list of labels.
+    """
+    if fmt == "csv":
+        rows = [row for row in csv.reader(io.StringIO(text, newline="")) if row]
+    else:
+        rows = [json.loads(line) for line in text.split("\n") if line.strip()]
+
+    return [row[textField] for row in rows], [row[labelField] for row in rows]
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# CLASSES
+#
+# ======================================================================================================================
+
+
+class CorpusIndex:
+    """
+    Random access to the items of a large CSV or JSONL corpus file without loading it into memory. The file is memory
+    mapped and an index of record offsets is built in one pass (or loaded from a saved index), so any range of items
+    or random sample can be read by slicing the map. The results can be passed straight to get_bags_of_words.
+
+    A CorpusIndex can be pickled, so it can be sent to worker processes, which reopen the memory map themselves. If the
+    index has been saved (or was loaded from a file), only the path of the index is pickled and the workers memory map
+    it too, so the offsets are never copied into each worker.
+    """
+
+    def __init__(self, path, offsets=None, fmt=None, textField=None, labelField=None, hasHeader=False,
+                 indexPath=None):
+        """
+        :param path       : the path of the corpus file.
+        :type path        : str
+
+        :param offsets    : a previously built index of record offsets. If None, the index is built.
+        :type offsets     : numpy.ndarray
+
+        :param fmt        : the format of the file, "csv" or "jsonl". By default it is taken from the file extension.
+        :type fmt         : str
+
+        :param textField  : the column index (CSV) or key (JSONL) of the text of each item, default 0 or "text".
+        :type textField   : int or str
+
+        :param labelField : the column index (CSV) or key (JSONL) of the label of each item, default 1 or "label".
+        :type labelField  : int or str
+
+        :param hasHeader  : whether the first record is a header which should be skipped, default False.
+        :type hasHeader   : bool
+
+        :param indexPath  : the path offsets was saved to, if any, default None.
+        :type indexPath   : str
+        """
+        self.path       = path
+        self.indexPath  = indexPath
+        self.fmt        = _get_file_format(path, fmt)
+        self.textField  = textField  if textField  is not None else (0 if self.fmt == "csv" else "text")
+        self.labelField = labelField if labelField is not None else (1 if self.fmt == "csv" else "label")
+        self.offsets    = offsets    if offsets    is not None else build_line_offset_index(path, fmt, hasHeader)
+
+        self._open()
+
+    @classmethod
+    def load(cls, path, indexPath, **kwargs):
+        """
+        Opens a corpus file with an index saved by save_index. The index is memory mapped rather than read into
+        memory.
+
+        :param path      : the path of the corpus file.
+        :type path       : str
+
+        :param indexPath : the path of the saved index.
+        :type indexPath  : str
+
+        :return          : a CorpusIndex object.
+        """
+        return cls(path, offsets=np.load(indexPath, mmap_mode="r"), indexPath=indexPath, **kwargs)
+
+    def save_index(self, indexPath):
+        """
+        Saves the index of record offsets so it does not need to be built again. From then on, pickling this object only
+        pickles the path of the index.
+
+        :param indexPath : the path to save the index to, conventionally ending in .npy.
+        :type indexPath  : str
+        """
+        # Saving to an open file stops np.save from adding .npy to the path
+        with open(indexPath, "wb") as f:
+            np.save(f, self.offsets)
+
+        self.indexPath = indexPath
+
+    def _open(self):
+        """
+        Opens the memory map of the corpus file.
+        """
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        """
+        Closes the memory map of the corpus file.
+        """
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_mmap"]
+
+        if self.indexPath is not None:
+            del state["offsets"]
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        if "offsets" not in state:
+            self.offsets = np.load(self.indexPath, mmap_mode="r")
+
+        self._open()
+
+    def __len__(self):
+        return self.offsets.size - 1
+
+    def get_record_bytes(self, idx):
+        """
+        Gets the raw bytes of a record as a zero-copy view of the memory map.
+
+        :param idx : the index of the record.
+        :type idx  : int
+
+        :return    : a memoryview of the bytes of the record.
+        """
+        return memoryview(self._mmap)[int(self.offsets[idx]):int(self.offsets[idx + 1])]
+
+    def get_items(self, start=0, stop=None):
+        """
+        Reads a contiguous range of items. The bytes of the whole range are decoded and parsed at once.
+
+        :param start : the index of the first item, default 0.
+        :type start  : int
+
+        :param stop  : the index after the last item, default the end of the corpus.
+        :type stop   : int
+
+        :return      : a list of sentences and a list of labels.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+
+        if start >= stop:
+            return [], []
+
+        text = self._mmap[int(self.offsets[start]):int(self.offsets[stop])].decode("utf-8", errors="replace")
+
+        return parse_records(text, self.fmt, self.textField, self.labelField)
+
+    def get_items_at(self, idxs):
+        """
+        Reads the items at arbitrary indices.
+
+        :param idxs : the indices of the items to read.
+        :type idxs  : list
+
+        :return     : a list of sentences and a list of labels, in the order of idxs.
+        """
+        sents, labels = [], []
+
+        for idx in idxs:
+
+            recordSents, recordLabels = parse_records(bytes(self.get_record_bytes(idx)).decode("utf-8", "replace"),
+                                                      self.fmt, self.textField, self.labelField)
+            sents  += recordSents
+            labels += recordLabels
+
+        return sents, labels
+
+    def get_sample(self, numItems, seed=None):
+        """
+        Reads a random sample of items, without replacement.
+
+        :param numItems : the number of items to sample.
+        :type numItems  : int
+
+        :param seed     : the random seed, default None.
+        :type seed      : int
+
+        :return         : a list of sentences and a list of labels.
+        """
+        idxs = np.random.default_rng(seed).choice(len(self), size=min(numItems, len(self)), replace=False)
+
+        # Reading in file order is kinder to the page cache
+        return self.get_items_at(np.sort(idxs))
+
+    def get_shard(self, shardIdx, numShards):
+        """
+        Reads one of numShards contiguous shards of roughly equal size.
+
+        :param shardIdx  : the index of the shard, from 0 to numShards - 1.
+        :type shardIdx   : int
+
+        :param numShards : the total number of shards.
+        :type numShards  : int
+
+        :return          : a list of sentences and a list of labels.
+        """
+        bounds = np.linspace(0, len(self), numShards + 1).astype(np.int64)
+
+        return self.get_items(bounds[shardIdx], bounds[shardIdx + 1])
+
+    def iter_batches(self, batchSize=100000):
+        """
+        Iterates over the corpus in batches of contiguous items.
+
+        :param batchSize : the number of items in each batch, default 100000.
+        :type batchSize  : int
+
+        :return          : a generator of (sentences, labels) tuples.
+        """
+        for start in range(0, len(self), batchSize):
+            yield self.get_items(start, start + batchSize)
+
+# ======================================================================================================================
@@ -11,10 +11,10 @@ import time
 import operator
 
 # >>>> Package Imports <<<<
-# None
+import numpy as np
 
 # >>>> This Package Imports <<<<
-# None
+from .sketches import SentenceLengthStatistics
 
 # ======================================================================================================================
 
@@ -63,7 +63,7 @@ def tokenize_sentence(sentence):
     return sentenceWords
 
 
-def get_bags_of_words(sents, labels):
+def get_bags_of_words(sents, labels, verbose=True):
     """
     Creates a "label bag-of-words" representation of the dataset and a normal bag of words for the dataset.
     Also counts the occurences of each class. A "label bag-of-words" is a dictionary where the keys are the labels of
@@ -77,13 +77,17 @@ def get_bags_of_words(sents, labels):
 
     A bag-of-words dictionary has keys as words and values as the count of occurrences of those words in the dataset.
 
-    :param sents  : a list of the sentences in the dataset. Each sentence is an untokenized string.
-    :type sents   : list
+    :param sents   : a list of the sentences in the dataset. Each sentence is an untokenized string.
+    :type sents    : list
 
-    :param labels : a list of the labels in the dataset. There is one label for every sentence.
-    :type labels  : list
+    :param labels  : a list of the labels in the dataset. There is one label for every sentence.
+    :type labels   : list
+
+    :param verbose : whether to print a loading bar, default True.
+    :type verbose  : bool
 
-    :return       : a label bag-of-words dictionary, a traditional bag of words, count of the labels, a list of sentence lengths
+    :return        : a label bag-of-words dictionary, a traditional bag of words, count of the labels and streaming
+                     statistics of the sentence lengths (a SentenceLengthStatistics object)
     """
 
     assert len(sents) > 0           , "You must provide at least one item of data"
@@ -93,27 +97,29 @@ def get_bags_of_words(sents, labels):
     labelBow                   = collections.defaultdict(lambda: collections.defaultdict(int))
     bow                        = collections.defaultdict(int)
     labelCount                 = collections.defaultdict(int)
-    sentsLenList               = []
+    sentLenStats               = SentenceLengthStatistics()
     count, numSents, startTime = 0, len(sents), time.time()
 
     for sent, label in zip(sents, labels):
 
-        count = _loading_bar(count, 30, numSents, startTime)
+        if verbose:
+            count = _loading_bar(count, 30, numSents, startTime)
 
         words = tokenize_sentence(sent)
 
         labelCount[label] += 1
 
-        sentsLenList.append(len(sent))
+        sentLenStats.update(len(sent))
 
         for word in words:
 
             labelBow[label][word] += 1
             bow[word]             += 1
 
-    print()
+    if verbose:
+        print()
 
-    return labelBow, bow, labelCount, sentsLenList
+    return labelBow, bow, labelCount, sentLenStats
 
 
 def count_labels(labels):
@@ -140,6 +146,39 @@ def count_labels(labels):
     return labelCount
 
 
+def encode_labels(labels):
+    """
+    Encodes the labels of the dataset as dense integer codes, in a single pass with a dictionary. Classes are numbered
+    in order of first occurrence, so the code of a label is its index in the returned list of classes. Labels are
+    compared as Python objects, so e.g. 1 and "1" are different classes. This is suitable for very large datasets.
+
+    :param labels : a list of the labels in the dataset. There is one label for every sentence.
+    :type labels  : list
+
+    :return       : a list of the distinct classes and an array with the integer code of every label.
+    """
+    codes      = {}
+    labelCodes = np.fromiter((codes.setdefault(label, len(codes)) for label in labels), dtype=np.int64,
+                             count=len(labels))
+
+    return list(codes), labelCodes
+
+
+def count_label_codes(labelCodes, numClasses=0):
+    """
+    Counts the occurrences of integer label codes, as returned by encode_labels.
+
+    :param labelCodes : an array of non-negative integer label codes.
+    :type labelCodes  : numpy.ndarray
+
+    :param numClasses : the minimum length of the returned count vector, default 0.
+    :type numClasses  : int
+
+    :return           : an array where the value at index i is the count of label code i.
+    """
+    return np.bincount(labelCodes, minlength=numClasses)
+
+
 def filter_top_words(labelBagOfWords, filterNum=10):
     """
     Filters all words out of the bag of words counts for each bag of words in the provided dictionary except for the
@@ -178,7 +217,7 @@ def _loading_bar(count, numSections, total, startTime):
     """
     Prints a loading bar.
     """
-    numPerSection = int(total / numSections)
+    numPerSection = max(1, int(total / numSections))
 
     sections = 0
     i = 0
@@ -0,0 +1,333 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import os
+import sys
+import time
+import queue
+import threading
+import collections
+import multiprocessing
+import concurrent.futures
+
+# >>>> Package Imports <<<<
+import numpy as np
+
+# >>>> This Package Imports <<<<
+from .corpus_index import NEWLINE, OUTSIDE_QUOTES, find_csv_record_ends, parse_records, _get_file_format
+from .data_structures import get_bags_of_words, _loading_bar
+from .sketches import SentenceLengthStatistics
+
+# ======================================================================================================================
+
+# Marks the end of the items in a queue
+END_OF_QUEUE = None
+
+# How long a blocked stage waits before checking whether the pipeline has been stopped, in seconds
+POLL_INTERVAL = 0.1
+
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def _find_record_ends(data, fmt, quoteState=OUTSIDE_QUOTES, previousByte=NEWLINE):
+    """
+    Finds the positions of the newlines which end a record in a block of bytes. In a CSV block, newlines inside quoted
+    fields do not end a record, so the state of the quote scanner and the byte before the block are passed in, and the
+    state at the end of the block is returned (see corpus_index.find_csv_record_ends).
+    """
+    if fmt == "csv":
+        return find_csv_record_ends(data, quoteState, previousByte)
+
+    return np.flatnonzero(data == NEWLINE), quoteState
+
+
+def _put(itemQueue, item, stopEvent):
+    """
+    Puts an item in a bounded queue, blocking while it is full (this is the backpressure between stages) unless the
+    pipeline is stopped.
+    """
+    while not stopEvent.is_set():
+        try:
+            itemQueue.put(item, timeout=POLL_INTERVAL)
+            return
+        except queue.Full:
+            pass
+
+
+def _get(itemQueue, stopEvent):
+    """
+    Gets an item from a queue, blocking while it is empty. If the pipeline is stopped, the end marker is returned.
+    """
+    while not stopEvent.is_set():
+        try:
+            return itemQueue.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            pass
+
+    return END_OF_QUEUE
+
+
+def _run_stage(stage, outQueue, stopEvent, *args):
+    """
+    Runs one stage of the pipeline in a thread. If the stage fails, the error is passed down the queue in place of the
+    end marker, so it is raised by the consumer.
+    """
+    try:
+        stage(outQueue, stopEvent, *args)
+        _put(outQueue, END_OF_QUEUE, stopEvent)
+    except Exception as error:
+        _put(outQueue, error, stopEvent)
+
+
+def _read_blocks(outQueue, stopEvent, path, fmt, hasHeader, blockSize):
+    """
+    Reader stage. Reads the file in blocks of about blockSize bytes, cut at record boundaries so that no record is
+    split between blocks. A record longer than blockSize is read over as many blocks as needed. Each byte is only
+    scanned once, however long the record.
+    """
+    leftover, quoteState, previousByte, bytesRead = [], OUTSIDE_QUOTES, NEWLINE, 0
+
+    with open(path, "rb") as f:
+
+        while not stopEvent.is_set():
+
+            block      = f.read(blockSize)
+            bytesRead += len(block)
+
+            if not block:
+                if leftover:
+                    _put(outQueue, (b"".join(leftover), bytesRead), stopEvent)
+                return
+
+            # The bytes before the block hold no record ends, so only the block needs to be scanned
+            recordEnds, quoteState = _find_record_ends(np.frombuffer(block, dtype=np.uint8), fmt, quoteState,
+                                                       previousByte)
+            previousByte = block[-1]
+
+            if recordEnds.size == 0:
+                leftover.append(block)
+                continue
+
+            end       = recordEnds[-1] + 1
+            records   = b"".join(leftover + [block[:end]])
+            headerEnd = len(records) - end + recordEnds[0] + 1
+            leftover  = [block[end:]]
+
+            if hasHeader:
+                records   = records[headerEnd:]
+                hasHeader = False
+
+            _put(outQueue, (records, bytesRead), stopEvent)
+            bytesRead = 0
+
+
+def _decode_blocks(outQueue, stopEvent, inQueue, fmt, textField, labelField, batchSize, executor):
+    """
+    Decode stage. Decodes and parses the blocks from the reader into batches of up to batchSize items. If there is an
+    executor, each batch is submitted to it for counting and the future is passed on, otherwise the batch itself is.
+    """
+    while True:
+
+        item = _get(inQueue, stopEvent)
+
+        if isinstance(item, Exception):
+            raise item
+
+        if item is END_OF_QUEUE:
+            return
+
+        block, numBytes = item
+
+        sents, labels = parse_records(block.decode("utf-8", errors="replace"), fmt, textField, labelField)
+
+        for start in range(0, max(len(sents), 1), batchSize):
+
+            batch  = (sents[start:start + batchSize], labels[start:start + batchSize])
+            isLast = start + batchSize >= len(sents)
+
+            if executor is not None and batch[0]:
+                batch = executor.submit(_count_batch, *batch)
+
+            # The bytes read are reported with the last batch of each block
+            _put(outQueue, (batch, numBytes if isLast else 0), stopEvent)
+
+
+def _count_batch(sents, labels):
+    """
+    Tokenize-and-count stage. Counts a batch of items with get_bags_of_words. This runs in the worker processes, so the
+    counts are returned as plain dictionaries, which can be pickled.
+    """
+    labelBow, bow, labelCount, sentLenStats = get_bags_of_words(sents, labels, verbose=False)
+
+    return {label: dict(wordCounts) for label, wordCounts in labelBow.items()}, dict(bow), dict(labelCount), \
+        sentLenStats
+
+
+def _merge_counts(counts, partialCounts):
+    """
+    Merges the counts of one batch into the running counts. Batches are merged in file order, so words and labels are
+    first seen in the same order as get_bags_of_words would see them.
+    """
+    labelBow, bow, labelCount, sentLenStats = counts
+    partialLabelBow, partialBow, partialLabelCount, partialSentLenStats = partialCounts
+
+    for label, wordCounts in partialLabelBow.items():
+
+        classBow = labelBow[label]
+
+        for word, count in wordCounts.items():
+            classBow[word] += count
+
+    for word, count in partialBow.items():
+        bow[word] += count
+
+    for label, count in partialLabelCount.items():
+        labelCount[label] += count
+
+    sentLenStats.merge(partialSentLenStats)
+
+
+def get_bags_of_words_from_file(path, fmt=None, textField=None, labelField=None, hasHeader=False, batchSize=10000,
+                                blockSize=4 * 1024 * 1024, queueSize=8, numWorkers=None, verbose=True):
+    """
+    Creates the same label bag-of-words, bag of words, label counts and sentence length statistics as
+    get_bags_of_words, straight from a CSV or JSONL corpus file, with reading, decoding and counting overlapped in a
+    pipeline:
+
+        reader thread -> decode thread -> tokenize-and-count worker processes -> merge (calling thread)
+
+    The stages are connected by queues which hold at most queueSize items, so a fast stage blocks when it gets too far
+    ahead of a slow one and memory use stays bounded however large the file is. Once the pipeline is full, the time
+    taken approaches that of the slowest stage rather than the sum of all of them.
+
+    :param path       : the path of the corpus file.
+    :type path        : str
+
+    :param fmt        : the format of the file, "csv" or "jsonl". By default it is taken from the file extension.
+    :type fmt         : str
+
+    :param textField  : the column index (CSV) or key (JSONL) of the text of each item, default 0 or "text".
+    :type textField   : int or str
+
+    :param labelField : the column index (CSV) or key (JSONL) of the label of each item, default 1 or "label".
+    :type labelField  : int or str
+
+    :param hasHeader  : whether the first record is a header which should be skipped, default False.
+    :type hasHeader   : bool
+
+    :param batchSize  : the number of items counted by a worker at once, default 10000.
+    :type batchSize   : int
+
+    :param blockSize  : the number of bytes read from the file at once, default 4MB.
+    :type blockSize   : int
+
+    :param queueSize  : the maximum number of blocks or batches waiting between two stages, default 8. At least two
+                        batches per worker may wait to be merged, so that no worker is left idle.
+    :type queueSize   : int
+
+    :param numWorkers : the number of worker processes, default one fewer than the number of CPUs, leaving one for the
+                        other stages. If 0, the items are counted in the calling thread, which still overlaps with
+                        reading and decoding. On Linux and other Unix systems the workers are forked, but on macOS
+                        and Windows they are spawned and import the calling script again, so there a script which
+                        calls this function with workers must do so under if __name__ == "__main__":
+    :type numWorkers  : int
+
+    :param verbose    : whether to print a loading bar, default True.
+    :type verbose     : bool
+
+    :return           : a label bag-of-words dictionary, a traditional bag of words, count of the labels and streaming
+                        statistics of the sentence lengths (a SentenceLengthStatistics object)
+    """
+    assert batchSize > 0 and blockSize > 0 and queueSize > 0, "The batch, block and queue sizes must be positive"
+
+    fmt        = _get_file_format(path, fmt)
+    textField  = textField  if textField  is not None else (0 if fmt == "csv" else "text")
+    labelField = labelField if labelField is not None else (1 if fmt == "csv" else "label")
+
+    labelBow     = collections.defaultdict(lambda: collections.defaultdict(int))
+    bow          = collections.defaultdict(int)
+    labelCount   = collections.defaultdict(int)
+    sentLenStats = SentenceLengthStatistics()
+    counts       = (labelBow, bow, labelCount, sentLenStats)
+
+    if numWorkers is None:
+        numWorkers = (os.cpu_count() or 1) - 1
+
+    # The batches being counted wait in the batch queue as futures, so it must hold enough of them to keep every worker
+    # busy
+    blockQueue = queue.Queue(maxsize=queueSize)
+    batchQueue = queue.Queue(maxsize=max(queueSize, 2 * numWorkers))
+    stopEvent  = threading.Event()
+
+    executor = None
+
+    if numWorkers > 0:
+        # The workers are forked where that is safe, so the calling script is not imported again in each of them. A
+        # process which is running threads can deadlock when forked, so every worker is started, by waiting on a
+        # first task, before the pipeline threads are
+        startMethod = "fork" if "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin" \
+            else "spawn"
+        executor    = concurrent.futures.ProcessPoolExecutor(max_workers=numWorkers,
+                                                             mp_context=multiprocessing.get_context(startMethod))
+        executor.submit(int).result()
+
+    stages = [
+        threading.Thread(target=_run_stage, daemon=True,
+                         args=(_read_blocks, blockQueue, stopEvent, path, fmt, hasHeader, blockSize)),
+        threading.Thread(target=_run_stage, daemon=True,
+                         args=(_decode_blocks, batchQueue, stopEvent, blockQueue, fmt, textField, labelField,
+                               batchSize, executor))
+    ]
+
+    fileSize, bytesDone, startTime = os.path.getsize(path), 0, time.time()
+
+    try:
+        for stage in stages:
+            stage.start()
+
+        while True:
+
+            item = batchQueue.get()
+
+            if item is END_OF_QUEUE:
+                break
+
+            if isinstance(item, Exception):
+                raise item
+
+            batch, numBytes = item
+
+            # The futures are queued in file order, so waiting on them in turn keeps the merge in file order
+            if isinstance(batch, concurrent.futures.Future):
+                _merge_counts(counts, batch.result())
+            elif batch[0]:
+                _merge_counts(counts, get_bags_of_words(*batch, verbose=False))
+
+            bytesDone += numBytes
+
+            if verbose and numBytes:
+                _loading_bar(bytesDone, 30, fileSize, startTime)
+
+    finally:
+        stopEvent.set()
+
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    if verbose:
+        print()
+
+    assert sentLenStats.count > 0, "You must provide at least one item of data"
+
+    return labelBow, bow, labelCount, sentLenStats
+
+# ======================================================================================================================
@@ -0,0 +1,259 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import math
+import random
+
+# >>>> Package Imports <<<<
+# None
+
+# >>>> This Package Imports <<<<
+# None
+
+# ======================================================================================================================
+
+
+# ======================================================================================================================
+#
+# CLASSES
+#
+# ======================================================================================================================
+
+
+class QuantileSketch:
+    """
+    A mergeable KLL quantile sketch (Karnin, Lang and Liberty, 2016). The sketch keeps a stack of compactors whose
+    capacities shrink geometrically towards the bottom of the stack, so memory is bounded by roughly 3 * k items no
+    matter how many values are added. The rank error is approximately 1.65 / k of the number of items. While fewer
+    than k items have been added the sketch is exact.
+
+    Two sketches with the same k can be merged, so shards of a dataset can be summarised independently and combined.
+    """
+
+    def __init__(self, k=200, seed=1):
+        """
+        :param k    : the accuracy parameter of the sketch, default 200.
+        :type k     : int
+
+        :param seed : seed for the random compaction offsets, default 1. With a fixed seed, the same values added in
+                      the same order always give the same estimates.
+        :type seed  : int
+        """
+        self.k          = k
+        self.compactors = []
+        self.size       = 0
+        self.maxSize    = 0
+        self.count      = 0
+        self._random    = random.Random(seed)
+
+        self._grow()
+
+    def _capacity(self, height):
+        """
+        Gets the capacity of the compactor at the given height.
+        """
+        depth = len(self.compactors) - height - 1
+
+        return int(math.ceil((2 / 3) ** depth * self.k)) + 1
+
+    def _grow(self):
+        """
+        Adds a compactor on top of the stack.
+        """
+        self.compactors.append([])
+        self.maxSize = sum([self._capacity(height) for height in range(len(self.compactors))])
+
+    def _compress(self):
+        """
+        Compacts the lowest compactor which is over capacity, promoting every other one of its items a level up.
+        """
+        for height, compactor in enumerate(self.compactors):
+
+            if len(compactor) >= self._capacity(height):
+
+                if height + 1 >= len(self.compactors):
+                    self._grow()
+
+                compactor.sort()
+
+                offset = self._random.randint(0, 1)
+                end    = len(compactor) - len(compactor) % 2
+
+                self.compactors[height + 1].extend(compactor[offset:end:2])
+
+                # An odd item out stays at this level
+                del compactor[:end]
+
+                self.size = sum([len(c) for c in self.compactors])
+
+                break
+
+    def update(self, value):
+        """
+        Adds a value to the sketch.
+
+        :param value : the value to add.
+        :type value  : float
+        """
+        self.compactors[0].append(value)
+        self.size  += 1
+        self.count += 1
+
+        if self.size >= self.maxSize:
+            self._compress()
+
+    def merge(self, other):
+        """
+        Merges another sketch into this one.
+
+        :param other : the sketch to merge. It must have the same k as this sketch.
+        :type other  : QuantileSketch
+        """
+        assert self.k == other.k, "Only sketches with the same k can be merged"
+
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+
+        for height, compactor in enumerate(other.compactors):
+            self.compactors[height].extend(compactor)
+
+        self.count += other.count
+        self.size   = sum([len(c) for c in self.compactors])
+
+        while self.size >= self.maxSize:
+            self._compress()
+
+    def quantile(self, q):
+        """
+        Gets an estimate of the q-th quantile of the values added to the sketch.
+
+        :param q : the quantile to estimate, between 0 and 1.
+        :type q  : float
+
+        :return  : the estimated quantile.
+        """
+        assert self.count > 0, "The sketch is empty"
+        assert 0 <= q <= 1   , "The quantile must be between 0 and 1"
+
+        weightedItems = sorted([(item, 2 ** height)
+                                for height, compactor in enumerate(self.compactors)
+                                for item in compactor])
+
+        totalWeight = sum([weight for _, weight in weightedItems])
+        targetRank  = max(1, math.ceil(q * totalWeight))
+
+        cumWeight = 0
+        for item, weight in weightedItems:
+            cumWeight += weight
+            if cumWeight >= targetRank:
+                return item
+
+        return weightedItems[-1][0]
+
+
+class SentenceLengthStatistics:
+    """
+    Streaming statistics of sentence lengths. The mean and standard deviation are kept as running moments (an exact
+    running total and Welford's algorithm for the variance) and quantiles are estimated with a QuantileSketch, so
+    memory use does not grow with the size of the dataset. Statistics from different shards can be combined with
+    merge.
+    """
+
+    def __init__(self, k=200, seed=1):
+        """
+        :param k    : the accuracy parameter of the quantile sketch, default 200.
+        :type k     : int
+
+        :param seed : seed for the quantile sketch, default 1.
+        :type seed  : int
+        """
+        self.count  = 0
+        self.total  = 0
+        self._mean  = 0.0
+        self.m2     = 0.0
+        self.sketch = QuantileSketch(k, seed)
+
+    @classmethod
+    def from_lengths(cls, sentsLenList, k=200, seed=1):
+        """
+        Builds the statistics from a list of sentence lengths.
+
+        :param sentsLenList : a list of sentence lengths.
+        :type sentsLenList  : list
+
+        :return             : a SentenceLengthStatistics object.
+        """
+        stats = cls(k, seed)
+
+        for length in sentsLenList:
+            stats.update(length)
+
+        return stats
+
+    def __len__(self):
+        return self.count
+
+    def update(self, length):
+        """
+        Adds the length of one sentence.
+
+        :param length : the length of the sentence.
+        :type length  : int
+        """
+        self.count += 1
+        self.total += length
+        delta       = length - self._mean
+        self._mean += delta / self.count
+        self.m2    += delta * (length - self._mean)
+
+        self.sketch.update(length)
+
+    def merge(self, other):
+        """
+        Merges the statistics of another shard into these statistics (Chan et al.'s parallel algorithm).
+
+        :param other : the statistics to merge.
+        :type other  : SentenceLengthStatistics
+        """
+        if other.count == 0:
+            return
+
+        count       = self.count + other.count
+        delta       = other._mean - self._mean
+        self._mean += delta * other.count / count
+        self.m2    += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count  = count
+        self.total += other.total
+
+        self.sketch.merge(other.sketch)
+
+    @property
+    def mean(self):
+        """
+        The mean sentence length.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        """
+        The population standard deviation of the sentence lengths.
+        """
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    def quantile(self, q):
+        """
+        Gets an estimate of the q-th quantile of the sentence lengths.
+
+        :param q : the quantile to estimate, between 0 and 1.
+        :type q  : float
+
+        :return  : the estimated quantile.
+        """
+        return self.sketch.quantile(q)
+
+# ======================================================================================================================
@@ -6,5 +6,12 @@ from .difficulty_measures import get_vocab_ratio
 from .difficulty_measures import get_mean_data_items_per_class
 from .difficulty_measures import get_minimum_data_items_in_a_class
 from .difficulty_measures import get_average_sentence_length
+from .difficulty_measures import get_sentence_length_distribution
 from .difficulty_measures import get_avg_mutual_information
 from .difficulty_measures import get_number_of_classes
+
+from .vectorized_measures import get_class_statistics
+from . import vectorized_measures
+from . import near_duplicates
+from . import distribution_shift
+from . import bootstrap
\ No newline at end of file
@@ -78,7 +78,51 @@ def _get_hellinger_distance(ngramCounts1, ngramCounts2):
     return hellingerDist
 
 
-def get_minimum_hellinger_distance(labelBagOfWords):
+def _get_top_words(wordTerms, topK):
+    """
+    Gets the topK words with the largest non-zero terms, largest first. Ties keep the order of wordTerms.
+
+    :param wordTerms : dictionary mapping words to their terms
+    :type wordTerms  : dict
+
+    :param topK      : the number of words to return
+    :type topK       : int
+
+    :return          : a list of (word, term) tuples
+    """
+    sortedTerms = sorted([(word, term) for word, term in wordTerms.items() if term], key=lambda x: -x[1])
+
+    return sortedTerms[:topK]
+
+
+def _get_hellinger_word_terms(ngramCounts1, ngramCounts2):
+    """
+    Gets the per-word terms behind the hellinger distance between two sets of ngrams and counts.
+
+    :param ngramCounts1 : dictionary mapping word to count
+    :type ngramCounts1  : dict
+
+    :param ngramCounts2 : dictionary mapping word to count
+    :type ngramCounts2  : dict
+
+    :return             : a dictionary mapping the words of ngramCounts1 to their (sqrt(p) - sqrt(q)) ** 2 terms, and
+                          a dictionary mapping the words of both to their sqrt(p * q) terms
+    """
+    totalWords1 = sum([val for key, val in ngramCounts1.items()])
+    totalWords2 = sum([val for key, val in ngramCounts2.items()])
+
+    distinguishing, shared = {}, {}
+    for ngram, count in ngramCounts1.items():
+        p = count / totalWords1
+        q = ngramCounts2.get(ngram, 0) / totalWords2
+
+        distinguishing[ngram] = (sqrt(p) - sqrt(q)) ** 2
+        shared[ngram]         = sqrt(p * q)
+
+    return distinguishing, shared
+
+
+def get_minimum_hellinger_distance(labelBagOfWords, explain=False, topK=10):
     """
     Calculates the minimum Hellinger distance between classes.
 
@@ -86,7 +130,17 @@ def get_minimum_hellinger_distance(labelBagOfWords):
                              bag-of-words dictionaries for the sentences in each class.
     :type labelBagOfWords  : dict
 
-    :return                : the minimum Hellinger distance between classes
+    :param explain         : whether to also return the words driving the distance between the closest pair of
+                             classes, default False. The explanation is a dictionary with the labels of the closest
+                             pair under "classes", the topK words with the largest (sqrt(p) - sqrt(q)) ** 2 terms
+                             under "distinguishing_words" and the topK words with the largest sqrt(p * q) terms under
+                             "shared_words".
+    :type explain          : bool
+
+    :param topK            : the number of words in each list of the explanation, default 10.
+    :type topK             : int
+
+    :return                : the minimum Hellinger distance between classes, and the explanation if explain is True.
     """
 
     done = set()
@@ -105,7 +159,21 @@ def get_minimum_hellinger_distance(labelBagOfWords):
             done.add((label, checkLabel))
             done.add((checkLabel, label))
 
-    return min([val for _, val in hellingerDists.items()])
+    minHellDist = min([val for _, val in hellingerDists.items()])
+
+    if explain:
+        label1, label2         = min(hellingerDists, key=hellingerDists.get)
+        distinguishing, shared = _get_hellinger_word_terms(labelBagOfWords[label1], labelBagOfWords[label2])
+
+        explanation = {
+            "classes"              : (label1, label2),
+            "distinguishing_words" : _get_top_words(distinguishing, topK),
+            "shared_words"         : _get_top_words(shared, topK)
+        }
+
+        return minHellDist, explanation
+
+    return minHellDist
 
 
 def get_mutual_information_from_count_dict(dict1, dict2=None):
@@ -158,7 +226,48 @@ def get_mutual_information_from_count_dict(dict1, dict2=None):
     return out
 
 
-def get_avg_mutual_information(labelBagOfWords):
+def _get_mutual_information_word_terms(dict1, dict2=None):
+    """
+    Gets the per-word terms of the mutual information of input dict 1 and 2, or entropy of dict1, as summed by
+    get_mutual_information_from_count_dict.
+
+    :param dict1 : dictionary of keys and counts
+    :type  dict1 : dict
+
+    :param dict2 : dictionary of keys and counts.
+    :type  dict2 : dict
+
+    :return      : a dictionary mapping the words of dict1 to their terms
+    """
+    total1 = sum([count for _, count in dict1.items()])
+    terms  = {}
+
+    # mutual information case
+    if dict2:
+        total2 = sum([count for _, count in dict2.items()])
+
+        for ngram, count1 in dict1.items():
+
+            if count1 and dict2.get(ngram):
+                count2 = dict2[ngram]
+
+                prob1  = count1 / total1
+                prob2  = count2 / total2
+                prob12 = (count1 + count2) / (total1 + total2)
+                terms[ngram] = prob12 * (np.log(prob12) - np.log(prob1) - np.log(prob2))
+
+    # entropy case
+    else:
+        for ngram, x in dict1.items():
+
+            prob = x/total1
+
+            terms[ngram] = -prob*np.log(prob)
+
+    return terms
+
+
+def get_avg_mutual_information(labelBagOfWords, explain=False, topK=10):
     """
     Calculates the average mutual information statistic between classes.
 
@@ -166,7 +275,16 @@ def get_avg_mutual_information(labelBagOfWords):
                              bag-of-words dictionaries for the sentences in each class.
     :type labelBagOfWords  : dict
 
-    :return                : the average mutual information between classes.
+    :param explain         : whether to also return the words contributing most to each cell of the mutual
+                             information matrix, default False. The explanation maps each pair of labels (label1,
+                             label2), with label1 first, to its topK words, largest first. Pairs of a label with
+                             itself are the entropy cells on the diagonal.
+    :type explain          : bool
+
+    :param topK            : the number of words to explain each cell with, default 10.
+    :type topK             : int
+
+    :return                : the average mutual information between classes, and the explanation if explain is True.
     """
     outMat       = np.zeros([len(labelBagOfWords), len(labelBagOfWords)])
 
@@ -188,7 +306,22 @@ def get_avg_mutual_information(labelBagOfWords):
 
                     outMat[jdx, idx] = outMat[idx, jdx]
 
-    return np.mean(outMat)
+    avgMutualInfo = np.mean(outMat)
+
+    if explain:
+        explanation = {}
+
+        for idx, label in enumerate(labels):
+            for label2 in labels[idx:]:
+
+                dict2 = filteredLBow[label2] if label2 != label else None
+                terms = _get_mutual_information_word_terms(filteredLBow[label], dict2)
+
+                explanation[(label, label2)] = _get_top_words(terms, topK)
+
+        return avgMutualInfo, explanation
+
+    return avgMutualInfo
 
 
 def get_class_imbalance(labelCounts):
@@ -284,12 +417,52 @@ def get_average_sentence_length(sentsLenList):
     """
     calculating the average sentence length of the sentences in the dataset.
 
-    :param sentsLenList : a list of sentence length
-    :type sentsLenList  : list
+    :param sentsLenList : a list of sentence length, or streaming sentence length statistics
+    :type sentsLenList  : list or datastructures.SentenceLengthStatistics
 
     :return             : average sentence length
     """
+    if isinstance(sentsLenList, datastructures.SentenceLengthStatistics):
+        return sentsLenList.mean
 
     return sum(sentsLenList) / len(sentsLenList)
 
-# ======================================================================================================================
+
+def get_sentence_length_distribution(sentsLenList):
+    """
+    Gets the mean, standard deviation and the 50th, 95th and 99th percentiles of the sentence lengths. Percentiles of
+    streaming statistics are estimated with their quantile sketch, so this runs in constant memory. Percentiles of a
+    list of lengths are computed exactly, as the smallest length with at least a fraction q of the lengths at or below
+    it.
+
+    :param sentsLenList : a list of sentence length, or streaming sentence length statistics
+    :type sentsLenList  : list or datastructures.SentenceLengthStatistics
+
+    :return             : a dictionary mapping the name of each statistic to its value.
+    """
+    if isinstance(sentsLenList, datastructures.SentenceLengthStatistics):
+        return {
+            "MEAN" : sentsLenList.mean,
+            "STD"  : sentsLenList.std,
+            "P50"  : sentsLenList.quantile(0.5),
+            "P95"  : sentsLenList.quantile(0.95),
+            "P99"  : sentsLenList.quantile(0.99)
+        }
+
+    sortedLens = sorted(sentsLenList)
+    numSents   = len(sortedLens)
+    meanLen    = sum(sortedLens) / numSents
+    stdLen     = sqrt(sum([(length - meanLen) ** 2 for length in sortedLens]) / numSents)
+
+    def quantile(q):
+        return sortedLens[max(1, int(np.ceil(q * numSents))) - 1]
+
+    return {
+        "MEAN" : meanLen,
+        "STD"  : stdLen,
+        "P50"  : quantile(0.5),
+        "P95"  : quantile(0.95),
+        "P99"  : quantile(0.99)
+    }
+
+# ======================================================================================================================
\ No newline at end of file
@@ -0,0 +1,185 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import itertools
+
+# >>>> Package Imports <<<<
+import numpy as np
+
+# >>>> This Package Imports <<<<
+from .vectorized_measures import get_count_matrix, _get_row_chunks
+
+# ======================================================================================================================
+
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def get_aligned_count_matrices(labelBagOfWords1, labelBagOfWords2):
+    """
+    Converts two label bag-of-words into count matrices with the same rows and columns. Rows are the union of the
+    labels of both datasets and columns are the union of their vocabularies, so the matrices can be compared directly.
+    Like vectorized_measures.get_count_matrix, each matrix is dense and takes 8 * classes * words bytes.
+
+    :param labelBagOfWords1 : bag of ngrams of the first dataset. Keys are the labels of the dataset, and the values
+                              are bag-of-words dictionaries for the sentences in each class.
+    :type labelBagOfWords1  : dict
+
+    :param labelBagOfWords2 : bag of ngrams of the second dataset, in the same format.
+    :type labelBagOfWords2  : dict
+
+    :return                 : the list of labels (row order), the vocabulary mapping and the two count matrices.
+    """
+    labels = list(dict.fromkeys(itertools.chain(labelBagOfWords1, labelBagOfWords2)))
+
+    words = dict.fromkeys(itertools.chain.from_iterable(
+        itertools.chain(labelBagOfWords1.values(), labelBagOfWords2.values())))
+    vocab = dict(zip(words, itertools.count()))
+
+    _, _, countMatrix1 = get_count_matrix({label: labelBagOfWords1.get(label, {}) for label in labels}, vocab)
+    _, _, countMatrix2 = get_count_matrix({label: labelBagOfWords2.get(label, {}) for label in labels}, vocab)
+
+    return labels, vocab, countMatrix1, countMatrix2
+
+
+def _get_row_hellinger_distances(countMatrix1, countMatrix2):
+    """
+    Gets the Hellinger distance between each row of one count matrix and the same row of the other. Unlike
+    difficulty_measures._get_hellinger_distance, the sum runs over the words of both distributions, so the distance
+    is symmetric. The rows are processed in chunks, so the temporary arrays stay within
+    vectorized_measures.MAX_CHUNK_ELEMENTS elements.
+    """
+    totals1   = countMatrix1.sum(axis=1, keepdims=True)
+    totals2   = countMatrix2.sum(axis=1, keepdims=True)
+    distances = np.zeros(countMatrix1.shape[0])
+
+    for rows in _get_row_chunks(countMatrix1.shape[0], countMatrix1.shape[1]):
+
+        probs1 = np.divide(countMatrix1[rows], totals1[rows], out=np.zeros_like(countMatrix1[rows]),
+                           where=totals1[rows] > 0)
+        probs2 = np.divide(countMatrix2[rows], totals2[rows], out=np.zeros_like(countMatrix2[rows]),
+                           where=totals2[rows] > 0)
+
+        distances[rows] = (1 / np.sqrt(2)) * np.sqrt(np.sum((np.sqrt(probs1) - np.sqrt(probs2)) ** 2, axis=1))
+
+    return distances
+
+
+def get_global_hellinger_distance(countMatrix1, countMatrix2):
+    """
+    Gets the Hellinger distance between the word distributions of two datasets, ignoring the labels.
+
+    :param countMatrix1 : the count matrix of the first dataset, as returned by get_aligned_count_matrices.
+    :type countMatrix1  : numpy.ndarray
+
+    :param countMatrix2 : the count matrix of the second dataset, as returned by get_aligned_count_matrices.
+    :type countMatrix2  : numpy.ndarray
+
+    :return             : the Hellinger distance between the word distributions.
+    """
+    return float(_get_row_hellinger_distances(countMatrix1.sum(axis=0, keepdims=True),
+                                              countMatrix2.sum(axis=0, keepdims=True))[0])
+
+
+def get_class_hellinger_distances(labels, countMatrix1, countMatrix2):
+    """
+    Gets the Hellinger distance between the word distributions of each class in two datasets. Classes which only
+    appear in one of the datasets are left out.
+
+    :param labels       : the labels of the rows of the count matrices.
+    :type labels        : list
+
+    :param countMatrix1 : the count matrix of the first dataset, as returned by get_aligned_count_matrices.
+    :type countMatrix1  : numpy.ndarray
+
+    :param countMatrix2 : the count matrix of the second dataset, as returned by get_aligned_count_matrices.
+    :type countMatrix2  : numpy.ndarray
+
+    :return             : a dictionary mapping labels to the Hellinger distance of their word distributions.
+    """
+    distances = _get_row_hellinger_distances(countMatrix1, countMatrix2)
+    inBoth    = (countMatrix1.sum(axis=1) > 0) & (countMatrix2.sum(axis=1) > 0)
+
+    return {label: float(distances[idx]) for idx, label in enumerate(labels) if inBoth[idx]}
+
+
+def get_label_distribution_shift(labelCounts1, labelCounts2):
+    """
+    Gets the Hellinger distance between the label distributions of two datasets.
+
+    :param labelCounts1 : dictionary mapping labels to a count of their occurences in the first dataset.
+    :type labelCounts1  : dict
+
+    :param labelCounts2 : dictionary mapping labels to a count of their occurences in the second dataset.
+    :type labelCounts2  : dict
+
+    :return             : the Hellinger distance between the label distributions.
+    """
+    labels = list(dict.fromkeys(itertools.chain(labelCounts1, labelCounts2)))
+
+    counts1 = np.array([[labelCounts1.get(label, 0) for label in labels]], dtype=np.float64)
+    counts2 = np.array([[labelCounts2.get(label, 0) for label in labels]], dtype=np.float64)
+
+    return float(_get_row_hellinger_distances(counts1, counts2)[0])
+
+
+def get_out_of_vocabulary_rate(countMatrix1, countMatrix2):
+    """
+    Gets the fraction of the words in the second dataset which never occur in the first dataset.
+
+    :param countMatrix1 : the count matrix of the first (e.g. training) dataset.
+    :type countMatrix1  : numpy.ndarray
+
+    :param countMatrix2 : the count matrix of the second (e.g. test) dataset.
+    :type countMatrix2  : numpy.ndarray
+
+    :return             : the out-of-vocabulary rate of the second dataset, or 0 if it has no words.
+    """
+    wordCounts2 = countMatrix2.sum(axis=0)
+    isUnseen    = countMatrix1.sum(axis=0) == 0
+
+    if wordCounts2.sum() == 0:
+        return 0.0
+
+    return float(wordCounts2[isUnseen].sum() / wordCounts2.sum())
+
+
+def get_distribution_shift(labelBagOfWords1, labelBagOfWords2, labelCounts1, labelCounts2):
+    """
+    Measures how different the second dataset (e.g. a test split) is from the first (e.g. the training split). The
+    vocabularies are aligned once and all of the distances are computed as array operations.
+
+    :param labelBagOfWords1 : bag of ngrams of the first dataset. Keys are the labels of the dataset, and the values
+                              are bag-of-words dictionaries for the sentences in each class.
+    :type labelBagOfWords1  : dict
+
+    :param labelBagOfWords2 : bag of ngrams of the second dataset, in the same format.
+    :type labelBagOfWords2  : dict
+
+    :param labelCounts1     : dictionary mapping labels to a count of their occurences in the first dataset.
+    :type labelCounts1      : dict
+
+    :param labelCounts2     : dictionary mapping labels to a count of their occurences in the second dataset.
+    :type labelCounts2      : dict
+
+    :return                 : a dictionary with the global, per-class and label distribution Hellinger distances and
+                              the out-of-vocabulary rate of the second dataset.
+    """
+    labels, _, countMatrix1, countMatrix2 = get_aligned_count_matrices(labelBagOfWords1, labelBagOfWords2)
+
+    return {
+        "GLOBAL_HELL_DIST" : get_global_hellinger_distance(countMatrix1, countMatrix2),
+        "CLASS_HELL_DISTS" : get_class_hellinger_distances(labels, countMatrix1, countMatrix2),
+        "LABEL_HELL_DIST"  : get_label_distribution_shift(labelCounts1, labelCounts2),
+        "OOV_RATE"         : get_out_of_vocabulary_rate(countMatrix1, countMatrix2)
+    }
+
+# ======================================================================================================================
@@ -0,0 +1,242 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import zlib
+
+# >>>> Package Imports <<<<
+import numpy as np
+
+# >>>> This Package Imports <<<<
+# None
+
+# ======================================================================================================================
+
+# The largest prime below 2 ** 32. Hash values are below 2 ** 32 and so are the permutation coefficients, which means
+# that a * x + b never overflows an unsigned 64 bit integer.
+MINHASH_PRIME = np.uint64(4294967291)
+
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def _get_shingles(words, shingleSize):
+    """
+    Gets the set of word n-grams of a tokenized sentence. Sentences shorter than the shingle size are a single shingle.
+    """
+    if len(words) < shingleSize:
+        return {" ".join(words)}
+
+    return {" ".join(words[i:i + shingleSize]) for i in range(len(words) - shingleSize + 1)}
+
+
+def get_minhash_signatures(sents, numPerm=128, shingleSize=2, seed=1, batchSize=1000, tokenizer=None):
+    """
+    Computes a MinHash signature for every sentence. Each sentence is represented by its set of word n-grams
+    (shingles), and the fraction of positions on which two signatures agree is an estimate of the Jaccard similarity
+    of the two sets. Sentences are processed in batches, with all of the hashing and minimising done as array
+    operations. If a tokenizer is given, sentences are tokenized batch by batch, so only one batch of token lists is
+    held in memory at a time.
+
+    :param sents       : a list of sentences. Each one is a list of words, or an untokenized string if a tokenizer is
+                         given.
+    :type sents        : list
+
+    :param numPerm     : the number of hash permutations i.e. the length of each signature, default 128.
+    :type numPerm      : int
+
+    :param shingleSize : the number of words in each shingle, default 2.
+    :type shingleSize  : int
+
+    :param seed        : seed for the hash permutations, default 1. Signatures are only comparable if they were
+                         computed with the same seed and number of permutations.
+    :type seed         : int
+
+    :param batchSize   : the number of sentences hashed at once, default 1000.
+    :type batchSize    : int
+
+    :param tokenizer   : a function splitting a sentence into words, e.g. datastructures.tokenize_sentence, default
+                         None i.e. the sentences are already tokenized.
+    :type tokenizer    : function
+
+    :return            : an array of shape [number of sentences, numPerm] of MinHash signatures.
+    """
+    rng = np.random.RandomState(seed)
+    a   = rng.randint(1, int(MINHASH_PRIME), size=numPerm).astype(np.uint64)[:, None]
+    b   = rng.randint(0, int(MINHASH_PRIME), size=numPerm).astype(np.uint64)[:, None]
+
+    signatures = np.empty([len(sents), numPerm], dtype=np.uint32)
+
+    for start in range(0, len(sents), batchSize):
+
+        shingleHashes, shingleCounts = [], []
+
+        for sent in sents[start:start + batchSize]:
+            shingles = _get_shingles(tokenizer(sent) if tokenizer is not None else sent, shingleSize)
+            shingleHashes.extend([zlib.crc32(shingle.encode()) for shingle in shingles])
+            shingleCounts.append(len(shingles))
+
+        hashes  = np.array(shingleHashes, dtype=np.uint64)
+        offsets = np.concatenate([[0], np.cumsum(shingleCounts)[:-1]])
+
+        permuted = (a * hashes[None, :] + b) % MINHASH_PRIME
+
+        signatures[start:start + len(shingleCounts)] = np.minimum.reduceat(permuted, offsets, axis=1).T
+
+    return signatures
+
+
+def _get_band_bucket_representatives(signatures, numBands):
+    """
+    Splits the signatures into bands and hashes every band into a bucket. For each band, returns the index of the first
+    item in the same bucket as each item, with shape [numBands, number of items].
+    """
+    numItems, numPerm = signatures.shape
+
+    assert numPerm % numBands == 0, "The number of permutations must be divisible by the number of bands"
+
+    rowsPerBand     = numPerm // numBands
+    representatives = np.empty([numBands, numItems], dtype=np.int64)
+
+    for band in range(numBands):
+
+        bandSigs = np.ascontiguousarray(signatures[:, band * rowsPerBand:(band + 1) * rowsPerBand])
+        bandKeys = bandSigs.view(np.dtype((np.void, bandSigs.dtype.itemsize * rowsPerBand))).ravel()
+
+        _, firstIdxs, bucketIds = np.unique(bandKeys, return_index=True, return_inverse=True)
+
+        representatives[band] = firstIdxs[bucketIds.ravel()]
+
+    return representatives
+
+
+def _get_signature_similarity(signatures, idxs1, idxs2):
+    """
+    Estimates the Jaccard similarity between pairs of items from the fraction of agreeing signature positions.
+    """
+    return (signatures[idxs1] == signatures[idxs2]).mean(axis=1)
+
+
+def get_near_duplicate_clusters(signatures, numBands=16, threshold=0.8):
+    """
+    Groups items into clusters of near-duplicates with locality sensitive hashing. Every item is compared only to the
+    first item in each of its LSH buckets, and is linked to it if their estimated Jaccard similarity is at least the
+    threshold. Clusters are the connected components of these links. This takes roughly linear time in the number of
+    items rather than comparing every pair.
+
+    :param signatures : an array of MinHash signatures, as returned by get_minhash_signatures.
+    :type signatures  : numpy.ndarray
+
+    :param numBands   : the number of LSH bands, default 16. It must divide the signature length.
+    :type numBands    : int
+
+    :param threshold  : the minimum estimated Jaccard similarity of near-duplicates, default 0.8.
+    :type threshold   : float
+
+    :return           : an array with a cluster id for every item. Items with the same id are near-duplicates.
+    """
+    numItems        = signatures.shape[0]
+    representatives = _get_band_bucket_representatives(signatures, numBands)
+
+    items    = np.tile(np.arange(numItems), numBands)
+    reps     = representatives.ravel()
+    isLinked = items != reps
+
+    edges = np.unique(np.stack([items[isLinked], reps[isLinked]], axis=1), axis=0)
+    edges = edges[_get_signature_similarity(signatures, edges[:, 0], edges[:, 1]) >= threshold]
+
+    # Connected components by min-label propagation with pointer jumping
+    clusterIds = np.arange(numItems)
+
+    while True:
+        minIds = np.minimum(clusterIds[edges[:, 0]], clusterIds[edges[:, 1]])
+
+        newIds = clusterIds.copy()
+        np.minimum.at(newIds, edges[:, 0], minIds)
+        np.minimum.at(newIds, edges[:, 1], minIds)
+        newIds = newIds[newIds]
+
+        if np.array_equal(newIds, clusterIds):
+            break
+
+        clusterIds = newIds
+
+    return clusterIds
+
+
+def get_duplicate_rate(clusterIds):
+    """
+    Gets the fraction of items which are redundant near-duplicates i.e. all but one item of every cluster.
+
+    :param clusterIds : an array with a cluster id for every item, as returned by get_near_duplicate_clusters.
+    :type clusterIds  : numpy.ndarray
+
+    :return           : the duplicate rate of the dataset.
+    """
+    return (clusterIds.size - np.unique(clusterIds).size) / clusterIds.size
+
+
+def get_conflicting_label_duplicate_rate(clusterIds, labelCodes):
+    """
+    Gets the fraction of items which are in a cluster of near-duplicates that has more than one label.
+
+    :param clusterIds : an array with a cluster id for every item, as returned by get_near_duplicate_clusters.
+    :type clusterIds  : numpy.ndarray
+
+    :param labelCodes : an array with the integer label code of every item, as returned by
+                        datastructures.encode_labels.
+    :type labelCodes  : numpy.ndarray
+
+    :return           : the fraction of items in clusters with conflicting labels.
+    """
+    clusterLabels     = np.unique(np.stack([clusterIds, labelCodes], axis=1), axis=0)
+    labelsPerCluster  = np.bincount(clusterLabels[:, 0], minlength=clusterIds.size)
+    isConflicting     = labelsPerCluster > 1
+
+    return float(isConflicting[clusterIds].mean())
+
+
+def get_overlap_rate(trainSignatures, testSignatures, numBands=16, threshold=0.8):
+    """
+    Gets the fraction of test items which have a near-duplicate in the training data, i.e. train/test leakage. Both
+    sets of signatures must be computed with the same seed and number of permutations.
+
+    :param trainSignatures : an array of MinHash signatures of the training data.
+    :type trainSignatures  : numpy.ndarray
+
+    :param testSignatures  : an array of MinHash signatures of the test data.
+    :type testSignatures   : numpy.ndarray
+
+    :param numBands        : the number of LSH bands, default 16. It must divide the signature length.
+    :type numBands         : int
+
+    :param threshold       : the minimum estimated Jaccard similarity of near-duplicates, default 0.8.
+    :type threshold        : float
+
+    :return                : the fraction of test items which overlap with the training data.
+    """
+    numTrain   = trainSignatures.shape[0]
+    signatures = np.concatenate([trainSignatures, testSignatures])
+
+    # Training items come first, so a bucket containing any training item has one as its representative
+    representatives = _get_band_bucket_representatives(signatures, numBands)[:, numTrain:]
+
+    isOverlapping = np.zeros(testSignatures.shape[0], dtype=bool)
+
+    for bandReps in representatives:
+
+        candidates = np.flatnonzero((bandReps < numTrain) & ~isOverlapping)
+        similar    = _get_signature_similarity(signatures, candidates + numTrain, bandReps[candidates]) >= threshold
+
+        isOverlapping[candidates[similar]] = True
+
+    return float(isOverlapping.mean())
+
+# ======================================================================================================================
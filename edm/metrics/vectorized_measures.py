@@ -0,0 +1,550 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import itertools
+
+# >>>> Package Imports <<<<
+import numpy as np
+
+# >>>> This Package Imports <<<<
+from edm import datastructures
+
+
+# ======================================================================================================================
+
+# The maximum number of elements in the temporary arrays built for one chunk of classes. Pairwise statistics are
+# computed a chunk of rows at a time, so memory use does not grow with the cube of the number of classes.
+MAX_CHUNK_ELEMENTS = 2 ** 22
+
+# The expanded form of the Hellinger sums loses precision to cancellation when two classes are close, so every pair
+# within this distance of the minimum sum is computed again directly
+HELLINGER_RECHECK_TOLERANCE = 1e-8
+
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# These functions are the "fast" engine. Each one computes the same statistic as the function of the same name in
+# difficulty_measures, but with NumPy array operations instead of Python loops over dictionaries.
+#
+# ======================================================================================================================
+
+
+def get_count_matrix(labelBagOfWords, vocab=None):
+    """
+    Converts a label bag-of-words into a dense matrix of counts, with one row per class and one column per word. The
+    matrix is dense, so it takes 8 * classes * words bytes, and the Hellinger distance holds two more arrays of the
+    same size (the probabilities and their square roots). For datasets with both many classes and a very large
+    vocabulary, the reference engine uses less memory.
+
+    :param labelBagOfWords : bag of ngrams in a specific format. Keys are the labels of the dataset, and the values are
+                             bag-of-words dictionaries for the sentences in each class.
+    :type labelBagOfWords  : dict
+
+    :param vocab           : a mapping from words to column indices. If None, the vocabulary of labelBagOfWords is
+                             used, in order of first occurrence.
+    :type vocab            : dict
+
+    :return                : the list of labels (row order), the vocabulary mapping and the count matrix.
+    """
+    labels = list(labelBagOfWords.keys())
+
+    if vocab is None:
+        words = dict.fromkeys(itertools.chain.from_iterable(labelBagOfWords.values()))
+        vocab = dict(zip(words, itertools.count()))
+
+    countMatrix = np.zeros([len(labels), len(vocab)])
+
+    for idx, label in enumerate(labels):
+
+        bow  = labelBagOfWords[label]
+        cols = np.fromiter(map(vocab.get, bow, itertools.repeat(-1)), dtype=np.int64, count=len(bow))
+        vals = np.fromiter(bow.values(), dtype=np.float64, count=len(bow))
+        keep = cols >= 0
+
+        countMatrix[idx, cols[keep]] = vals[keep]
+
+    return labels, vocab, countMatrix
+
+
+def _get_label_count_vector(labelCounts):
+    """
+    Converts a dictionary mapping labels to counts into an array of counts.
+    """
+    return np.fromiter(labelCounts.values(), dtype=np.int64, count=len(labelCounts))
+
+
+def filter_top_words(labelBagOfWords, filterNum=10):
+    """
+    Keeps only the top N most frequent non-stopword words of each class, as datastructures.filter_top_words does, but
+    uses partial selection instead of sorting every bag of words. Ties are broken in the same order, so the results are
+    identical.
+
+    :param labelBagOfWords : bag of ngrams in a specific format. Keys are the labels of the dataset, and the values are
+                             bag-of-words dictionaries for the sentences in each class.
+    :type labelBagOfWords  : dict
+
+    :param filterNum       : top N frequent words to keep, default 10.
+    :type filterNum        : int
+
+    :return                : labelBagOfWords with filtered counts.
+    """
+    filteredBow = {}
+
+    for label, bow in labelBagOfWords.items():
+
+        words  = list(bow)
+        counts = np.fromiter(bow.values(), dtype=np.int64, count=len(bow))
+        isStop = np.fromiter(map(datastructures.STOPWORDS.__contains__, words), dtype=bool, count=len(bow))
+
+        candidates = np.flatnonzero(~isStop)
+
+        if candidates.size > filterNum:
+            kth        = candidates.size - filterNum
+            threshold  = np.partition(counts[candidates], kth)[kth]
+            candidates = candidates[counts[candidates] >= threshold]
+
+        topIdxs = candidates[np.argsort(-counts[candidates], kind="stable")][:filterNum]
+
+        filteredBow[label] = {words[idx]: int(counts[idx]) for idx in topIdxs}
+
+    return filteredBow
+
+
+def _get_row_chunks(numRows, elementsPerRow):
+    """
+    Splits range(numRows) into consecutive slices of rows whose temporary arrays have at most MAX_CHUNK_ELEMENTS
+    elements.
+    """
+    chunkSize = max(1, MAX_CHUNK_ELEMENTS // max(1, elementsPerRow))
+
+    return [slice(start, start + chunkSize) for start in range(0, numRows, chunkSize)]
+
+
+def _get_hellinger_sums(countMatrix):
+    """
+    Gets the matrix of sums of (sqrt(p) - sqrt(q)) ** 2 between every pair of rows of a count matrix. As in
+    difficulty_measures._get_hellinger_distance, the sum for entry [i, j] is only taken over the words in class i.
+    """
+    totals   = countMatrix.sum(axis=1, keepdims=True)
+    probs    = np.divide(countMatrix, totals, out=np.zeros_like(countMatrix), where=totals > 0)
+    sqrtProb = np.sqrt(probs)
+
+    # sum_{w in i} (sqrt(p) - sqrt(q)) ** 2 = sum_{w in i} p - 2 * sum_w sqrt(p * q) + sum_{w in i} q
+    sums = probs.sum(axis=1)[:, None] - 2 * (sqrtProb @ sqrtProb.T)
+
+    for rows in _get_row_chunks(countMatrix.shape[0], countMatrix.shape[1]):
+        sums[rows] += (countMatrix[rows] > 0).astype(np.float64) @ probs.T
+
+    return np.maximum(sums, 0)
+
+
+def _get_direct_hellinger_sums(countMatrix, rows, cols):
+    """
+    Gets the sums of (sqrt(p) - sqrt(q)) ** 2 over the words in class rows[k] between rows[k] and cols[k] of a count
+    matrix, computed term by term. This is slower than _get_hellinger_sums but does not suffer from cancellation.
+    """
+    totals = countMatrix.sum(axis=1, keepdims=True)
+    sums   = np.zeros(len(rows))
+
+    for chunk in _get_row_chunks(len(rows), countMatrix.shape[1]):
+
+        counts1 = countMatrix[rows[chunk]]
+        probs1  = counts1 / totals[rows[chunk]]
+        probs2  = np.divide(countMatrix[cols[chunk]], totals[cols[chunk]], out=np.zeros_like(counts1),
+                            where=totals[cols[chunk]] > 0)
+
+        sums[chunk] = np.sum(np.where(counts1 > 0, (np.sqrt(probs1) - np.sqrt(probs2)) ** 2, 0), axis=1)
+
+    return sums
+
+
+def _get_closest_pair(countMatrix):
+    """
+    Gets the closest pair of classes of a count matrix, comparing each pair once with the class seen first as the
+    first distribution, and the Hellinger sum between them. Near-minimal pairs are computed again directly, so the
+    pair and the sum are those the reference engine would find.
+    """
+    sums = _get_hellinger_sums(countMatrix)
+
+    rows, cols = np.triu_indices(countMatrix.shape[0], k=1)
+    pairSums   = sums[rows, cols]
+    candidates = np.flatnonzero(pairSums <= pairSums.min() + HELLINGER_RECHECK_TOLERANCE)
+    directSums = _get_direct_hellinger_sums(countMatrix, rows[candidates], cols[candidates])
+    closest    = candidates[np.argmin(directSums)]
+
+    return rows[closest], cols[closest], directSums.min()
+
+
+def _get_top_word_arrays(filteredLBow):
+    """
+    Converts a label bag-of-words filtered with filter_top_words into arrays with one row per class and one column per
+    top word: the vocabulary index of each top word, or -1 where a class has fewer top words, and its count.
+
+    :return : the list of labels (row order), the list of words, the top word index array and the top count array.
+    """
+    labels  = list(filteredLBow.keys())
+    words   = dict.fromkeys(itertools.chain.from_iterable(filteredLBow.values()))
+    vocab   = dict(zip(words, itertools.count()))
+    numTop  = max([len(bow) for bow in filteredLBow.values()] + [1])
+
+    topIdxs   = np.full([len(labels), numTop], -1, dtype=np.int64)
+    topCounts = np.zeros([len(labels), numTop])
+
+    for idx, label in enumerate(labels):
+
+        bow = filteredLBow[label]
+
+        topIdxs[idx, :len(bow)]   = [vocab[word] for word in bow]
+        topCounts[idx, :len(bow)] = list(bow.values())
+
+    return labels, list(vocab), topIdxs, topCounts
+
+
+def _get_entropy_terms(topCounts):
+    """
+    Gets the per-word terms of the entropy of each row of a top count array, and the log probabilities of the words.
+    """
+    totals   = topCounts.sum(axis=1, keepdims=True)
+    probs    = np.divide(topCounts, totals, out=np.zeros_like(topCounts), where=topCounts > 0)
+    logProbs = np.log(probs, out=np.zeros_like(probs), where=probs > 0)
+
+    return -probs * logProbs, logProbs
+
+
+def _iter_mutual_information_terms(topIdxs, topCounts, logProbs):
+    """
+    Iterates over chunks of rows of the per-word terms of the mutual information between every pair of classes, with
+    shape [rows, classes, top words of the row class]. Summing over the last axis gives the values computed by
+    difficulty_measures.get_mutual_information_from_count_dict. Each top word of class i is matched against the top
+    words of class j, so the temporary arrays are [rows, classes, top words, top words] rather than one column per word
+    of the vocabulary.
+
+    :return : a generator of (row slice, terms) tuples.
+    """
+    numClasses, numTop = topIdxs.shape
+
+    totals  = topCounts.sum(axis=1)
+    isTop   = topIdxs >= 0
+    counts2 = topCounts[None, :, None, :]
+    logPr2  = logProbs[None, :, None, :]
+
+    for rows in _get_row_chunks(numClasses, numClasses * numTop * numTop):
+
+        # matches[r, j, a, b] is True if top word a of class r is top word b of class j
+        matches = (topIdxs[rows, None, :, None] == topIdxs[None, :, None, :]) & \
+            isTop[rows, None, :, None] & isTop[None, :, None, :]
+
+        pairTotal = (totals[rows, None] + totals[None, :])[:, :, None, None]
+        probs12   = np.divide(topCounts[rows, None, :, None] + counts2, pairTotal, out=np.zeros(matches.shape),
+                              where=matches)
+        logProb12 = np.log(probs12, out=np.zeros_like(probs12), where=matches)
+
+        terms = np.where(matches, probs12 * (logProb12 - logProbs[rows, None, :, None] - logPr2), 0)
+
+        yield rows, terms.sum(axis=3)
+
+
+def _get_entropy_fallback_mask(totals):
+    """
+    Gets a mask of the cells [i, j], with i < j, of the mutual information matrix which hold the entropy of class i,
+    because get_mutual_information_from_count_dict falls back to the entropy when the second dictionary is empty.
+    """
+    numClasses = totals.shape[0]
+    upper      = np.triu(np.ones([numClasses, numClasses], dtype=bool), k=1)
+
+    return upper & (totals == 0)[None, :]
+
+
+def _get_top_word_contributions(contributions, words, topK):
+    """
+    Gets the topK words with the largest contributions, largest first, using partial selection rather than a full
+    sort. Words which do not contribute are left out.
+    """
+    candidates = np.flatnonzero(contributions)
+
+    if candidates.size > topK:
+        candidates = candidates[np.argpartition(-contributions[candidates], topK - 1)[:topK]]
+
+    topIdxs = candidates[np.argsort(-contributions[candidates], kind="stable")]
+
+    return [(words[idx], float(contributions[idx])) for idx in topIdxs]
+
+
+def get_class_statistics(labelCountVector):
+    """
+    Calculates all of the class-level statistics of the dataset from a single vector of label counts, such as the one
+    returned by datastructures.count_label_codes. Classes with a count of zero are ignored, so the results agree with
+    the dictionary based functions in difficulty_measures.
+
+    :param labelCountVector : an array where each value is the count of occurrences of one class in the data.
+    :type labelCountVector  : numpy.ndarray
+
+    :return                 : a dictionary mapping the name of each class statistic to its value.
+    """
+    counts     = np.asarray(labelCountVector)
+    counts     = counts[counts > 0]
+
+    assert counts.size > 0, "You must provide at least one non-zero label count"
+
+    numClasses = counts.size
+    totalData  = counts.sum()
+    probs      = counts / totalData
+
+    return {
+        "CLASS_DIVERSITY"      : float(-np.sum(probs * np.log(probs))),
+        "CLASS_IMBAL"          : float(np.sum(np.abs((1 / numClasses) - probs))),
+        "NUM_CLASSES"          : int(numClasses),
+        "MEAN_ITEMS_PER_CLASS" : float(totalData / numClasses),
+        "MIN_ITEMS_IN_A_CLASS" : int(counts.min())
+    }
+
+
+def get_class_diversity(labelCounts):
+    """
+    Calculates Shannon label diversity i.e. the Class Diversity.
+
+    :param labelCounts : dictionary mapping labels to a count of their occurences in the data.
+    :type labelCounts  : dict
+
+    :return            : shannon label diversity (class diversity)
+    """
+    return get_class_statistics(_get_label_count_vector(labelCounts))["CLASS_DIVERSITY"]
+
+
+def get_class_imbalance(labelCounts):
+    """
+    Calculates the imbalance in classes in the data.
+
+    :param labelCounts : dictionary mapping labels to a count of their occurences in the data.
+    :type labelCounts  : dict
+
+    :return            : class imbalance metric
+    """
+    return get_class_statistics(_get_label_count_vector(labelCounts))["CLASS_IMBAL"]
+
+
+def get_mean_data_items_per_class(labelCounts):
+    """
+    Gets the mean number of data items per class.
+
+    :param labelCounts : dictionary mapping labels to a count of their occurences in the data.
+    :type labelCounts  : dict
+
+    :return            : mean data items per class
+    """
+    return get_class_statistics(_get_label_count_vector(labelCounts))["MEAN_ITEMS_PER_CLASS"]
+
+
+def get_minimum_data_items_in_a_class(labelCounts):
+    """
+    Gets the number of data items in the smallest class.
+
+    :param labelCounts : dictionary mapping labels to a count of their occurrences in the data.
+    :type labelCounts  : dict
+
+    :return            : minimum data items in classes
+    """
+    return get_class_statistics(_get_label_count_vector(labelCounts))["MIN_ITEMS_IN_A_CLASS"]
+
+
+def get_number_of_classes(labelsCounts):
+    """
+    Counts how many classes there are in the dataset.
+
+    :param labelsCounts : a dictionary mapping labels to a count of their occurrences.
+    :type labelsCounts  : dict
+
+    :return             : the number of different labels in the dataset.
+    """
+    return len(labelsCounts)
+
+
+def get_vocab_size(bow):
+    """
+    Gets the vocab size from a traditional bag of words
+
+    :param bow : traditional bag of words mapping words to a count of their occurences.
+    :type  bow : dict
+
+    :return    : the vocab size of the dataset
+    """
+    return len(bow)
+
+
+def get_vocab_ratio(bow):
+    """
+    Gets the ratio of distinct words to total words from a traditional bag of words.
+
+    :param bow : traditional bag of words mapping words to a count of their occurences.
+    :type  bow : dict
+
+    :return    : the ratio of distinct words to total words
+    """
+    return len(bow) / np.fromiter(bow.values(), dtype=np.int64, count=len(bow)).sum()
+
+
+def get_minimum_hellinger_distance(labelBagOfWords, explain=False, topK=10):
+    """
+    Calculates the minimum Hellinger distance between classes.
+
+    With explain=True, also explains which words drive the distance between the closest pair of classes. The
+    explanation is a dictionary with:
+
+    - "classes"                : the labels of the closest pair of classes.
+    - "distinguishing_words"   : the topK words with the largest (sqrt(p) - sqrt(q)) ** 2 terms, i.e. the words which
+                                 most separate the two classes.
+    - "shared_words"           : the topK words with the largest sqrt(p * q) terms, i.e. the words which most make the
+                                 two classes look alike.
+
+    :param labelBagOfWords : bag of ngrams in a specific format. Keys are the labels of the dataset, and the values are
+                             bag-of-words dictionaries for the sentences in each class.
+    :type labelBagOfWords  : dict
+
+    :param explain         : whether to also return an explanation, default False.
+    :type explain          : bool
+
+    :param topK            : the number of words in each list of the explanation, default 10.
+    :type topK             : int
+
+    :return                : the minimum Hellinger distance between classes, and the explanation if explain is True.
+    """
+    assert len(labelBagOfWords) > 1, "There must be at least two classes to compare"
+
+    labels, vocab, countMatrix = get_count_matrix(labelBagOfWords)
+
+    idx, jdx, minSum = _get_closest_pair(countMatrix)
+
+    minHellDist = (1 / np.sqrt(2)) * np.sqrt(minSum)
+
+    if not explain:
+        return minHellDist
+
+    words    = list(vocab)
+    sqrtP    = np.sqrt(countMatrix[idx] / countMatrix[idx].sum())
+    sqrtQ    = np.sqrt(countMatrix[jdx] / countMatrix[jdx].sum())
+
+    # As in the distance, only the words of the first class contribute
+    distinguishing = np.where(countMatrix[idx] > 0, (sqrtP - sqrtQ) ** 2, 0)
+
+    explanation = {
+        "classes"              : (labels[idx], labels[jdx]),
+        "distinguishing_words" : _get_top_word_contributions(distinguishing, words, topK),
+        "shared_words"         : _get_top_word_contributions(sqrtP * sqrtQ, words, topK)
+    }
+
+    return minHellDist, explanation
+
+
+def get_avg_mutual_information(labelBagOfWords, explain=False, topK=10):
+    """
+    Calculates the average mutual information statistic between classes.
+
+    With explain=True, also returns a dictionary mapping each pair of labels (label1, label2) to the topK words with
+    the largest terms in that cell of the mutual information matrix, largest first. Pairs of a label with itself are
+    the entropy cells on the diagonal.
+
+    :param labelBagOfWords : bag of ngrams in a specific format. Keys are the labels of the dataset, and the values are
+                             bag-of-words dictionaries for the sentences in each class.
+    :type labelBagOfWords  : dict
+
+    :param explain         : whether to also return an explanation, default False.
+    :type explain          : bool
+
+    :param topK            : the number of words to explain each cell with, default 10.
+    :type topK             : int
+
+    :return                : the average mutual information between classes, and the explanation if explain is True.
+    """
+    filteredLBow = filter_top_words(labelBagOfWords)
+
+    labels, words, topIdxs, topCounts = _get_top_word_arrays(filteredLBow)
+    entropyTerms, logProbs            = _get_entropy_terms(topCounts)
+
+    entropies    = entropyTerms.sum(axis=1)
+    fallbackMask = _get_entropy_fallback_mask(topCounts.sum(axis=1))
+    outMat       = np.zeros([len(labels), len(labels)])
+    explanation  = {}
+
+    for rows, cellTerms in _iter_mutual_information_terms(topIdxs, topCounts, logProbs):
+
+        outMat[rows] = cellTerms.sum(axis=2)
+
+        if not explain:
+            continue
+
+        for idx in range(len(labels))[rows]:
+
+            rowWords = [words[wordIdx] if wordIdx >= 0 else None for wordIdx in topIdxs[idx]]
+
+            for jdx in range(idx, len(labels)):
+
+                isEntropy = idx == jdx or fallbackMask[idx, jdx]
+                terms     = entropyTerms[idx] if isEntropy else cellTerms[idx - rows.start, jdx]
+
+                explanation[(labels[idx], labels[jdx])] = _get_top_word_contributions(terms, rowWords, topK)
+
+    # The cells are filled exactly as difficulty_measures.get_avg_mutual_information fills them
+    outMat = np.where(fallbackMask, entropies[:, None], outMat)
+    outMat = np.triu(outMat, k=1)
+    outMat = outMat + outMat.T + np.diag(entropies)
+
+    avgMutualInfo = np.mean(outMat)
+
+    if not explain:
+        return avgMutualInfo
+
+    return avgMutualInfo, explanation
+
+
+def get_average_sentence_length(sentsLenList):
+    """
+    calculating the average sentence length of the sentences in the dataset.
+
+    :param sentsLenList : a list of sentence length, or streaming sentence length statistics
+    :type sentsLenList  : list or datastructures.SentenceLengthStatistics
+
+    :return             : average sentence length
+    """
+    if isinstance(sentsLenList, datastructures.SentenceLengthStatistics):
+        return sentsLenList.mean
+
+    return np.mean(sentsLenList)
+
+
+def get_sentence_length_distribution(sentsLenList):
+    """
+    Gets the mean, standard deviation and the 50th, 95th and 99th percentiles of the sentence lengths. The percentiles
+    of a list of lengths are computed exactly.
+
+    :param sentsLenList : a list of sentence length, or streaming sentence length statistics
+    :type sentsLenList  : list or datastructures.SentenceLengthStatistics
+
+    :return             : a dictionary mapping the name of each statistic to its value.
+    """
+    if isinstance(sentsLenList, datastructures.SentenceLengthStatistics):
+        return {
+            "MEAN" : sentsLenList.mean,
+            "STD"  : sentsLenList.std,
+            "P50"  : sentsLenList.quantile(0.5),
+            "P95"  : sentsLenList.quantile(0.95),
+            "P99"  : sentsLenList.quantile(0.99)
+        }
+
+    lengths = np.asarray(sentsLenList)
+    p50, p95, p99 = np.quantile(lengths, [0.5, 0.95, 0.99], method="inverted_cdf")
+
+    return {
+        "MEAN" : lengths.mean(),
+        "STD"  : lengths.std(),
+        "P50"  : p50,
+        "P95"  : p95,
+        "P99"  : p99
+    }
+
+# ======================================================================================================================
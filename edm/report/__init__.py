@@ -1 +1,4 @@
-from .report_creator import get_difficulty_report, get_difficulty_components_dict
\ No newline at end of file
+from .report_creator import get_difficulty_report, get_difficulty_components_dict
+from .report_creator import get_difficulty_intervals, get_difficulty_interval_report
+from .report_creator import get_duplicate_statistics, generate_report
+from .report_creator import get_distribution_shift_report, get_distribution_shift_dict
\ No newline at end of file
@@ -0,0 +1,333 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import os
+import re
+import sys
+import csv
+import json
+import time
+import sqlite3
+import argparse
+import traceback
+import concurrent.futures
+csv.field_size_limit(sys.maxsize)  # Needed to load datasets with very long items
+
+# >>>> Package Imports <<<<
+# None
+
+# >>>> This Package Imports <<<<
+from edm import datastructures
+from edm.report import report_creator
+
+# ======================================================================================================================
+
+# A result is only reused for the same dataset file, unchanged since it was scored, with the same job config
+RESULTS_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    dataset     TEXT NOT NULL,
+    config      TEXT NOT NULL,
+    file_mtime  REAL,
+    file_size   INTEGER,
+    status      TEXT NOT NULL,
+    components  TEXT,
+    generic     TEXT,
+    timings     TEXT,
+    error       TEXT,
+    finished_at REAL,
+    PRIMARY KEY (dataset, config)
+)
+"""
+
+STATUS_DONE   = "done"
+STATUS_FAILED = "failed"
+
+# Matches the terminal colour codes which report_creator adds to severities
+COLOR_CODE_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def load_csv_dataset(path, textColumn=0, labelColumn=1, hasHeader=False):
+    """
+    Loads a dataset from a .csv file.
+
+    :param path        : the path of the .csv file.
+    :type path         : str
+
+    :param textColumn  : the index of the column with the text of each item, default 0.
+    :type textColumn   : int
+
+    :param labelColumn : the index of the column with the label of each item, default 1.
+    :type labelColumn  : int
+
+    :param hasHeader   : whether the first row of the file is a header, default False.
+    :type hasHeader    : bool
+
+    :return            : a list of sentences and a list of labels.
+    """
+    sents, labels = [], []
+
+    with open(path, "r", newline="") as f:
+
+        reader = csv.reader(f)
+
+        if hasHeader:
+            next(reader, None)
+
+        for row in reader:
+            if row:
+                sents.append(row[textColumn])
+                labels.append(row[labelColumn])
+
+    return sents, labels
+
+
+def read_manifest(manifestPath):
+    """
+    Reads a manifest of dataset files. The manifest has one path per line. Blank lines and lines starting with "#" are
+    ignored, and relative paths are relative to the directory of the manifest.
+
+    :param manifestPath : the path of the manifest file.
+    :type manifestPath  : str
+
+    :return             : a list of absolute paths of dataset files, in the order of the manifest.
+    """
+    manifestDir = os.path.dirname(os.path.abspath(manifestPath))
+    paths       = []
+
+    with open(manifestPath, "r") as f:
+        for line in f:
+
+            line = line.strip()
+
+            if line and not line.startswith("#"):
+                paths.append(os.path.normpath(os.path.join(manifestDir, line)))
+
+    return list(dict.fromkeys(paths))
+
+
+def _to_plain_stats(statsList):
+    """
+    Converts a list of (name, value, severity) tuples to a JSON serialisable dictionary mapping names to a value and a
+    severity without colour codes.
+    """
+    return {name: [float(value), COLOR_CODE_PATTERN.sub("", severity)] for name, value, severity in statsList}
+
+
+def score_dataset(path, textColumn=0, labelColumn=1, hasHeader=False, engine="reference"):
+    """
+    Scores a single dataset file. This runs in the worker processes of run_batch.
+
+    :param path        : the path of the .csv dataset file.
+    :type path         : str
+
+    :param textColumn  : the index of the column with the text of each item, default 0.
+    :type textColumn   : int
+
+    :param labelColumn : the index of the column with the label of each item, default 1.
+    :type labelColumn  : int
+
+    :param hasHeader   : whether the first row of the file is a header, default False.
+    :type hasHeader    : bool
+
+    :param engine      : which engine computes the statistics, "reference" or "fast". Default "reference".
+    :type engine       : str
+
+    :return            : a dictionary with the difficulty components, generic statistics and timings of each stage.
+    """
+    timings   = {}
+    startTime = time.time()
+
+    sents, labels = load_csv_dataset(path, textColumn, labelColumn, hasHeader)
+    timings["load"] = time.time() - startTime
+
+    stageTime = time.time()
+    labelBow, wordCounts, labelCounts, sentLenStats = datastructures.get_bags_of_words(sents, labels, verbose=False)
+    timings["bags_of_words"] = time.time() - stageTime
+
+    stageTime = time.time()
+    components = report_creator.get_difficulty_estimate(labelBow, wordCounts, labelCounts, engine)
+    timings["difficulty"] = time.time() - stageTime
+
+    stageTime = time.time()
+    generic = report_creator.get_generic_statistics(wordCounts, labelCounts, sentLenStats, engine)
+    timings["generic"] = time.time() - stageTime
+
+    timings["total"] = time.time() - startTime
+
+    return {
+        "components" : _to_plain_stats(components),
+        "generic"    : _to_plain_stats(generic),
+        "timings"    : timings
+    }
+
+
+def _score_dataset_safely(path, **kwargs):
+    """
+    Scores a dataset, returning the traceback instead of raising if anything goes wrong.
+    """
+    try:
+        return score_dataset(path, **kwargs), None
+    except Exception:
+        return None, traceback.format_exc()
+
+
+def get_file_stamp(path):
+    """
+    Gets the modification time and size of a dataset file, which change if the file is rewritten.
+
+    :param path : the path of the dataset file.
+    :type path  : str
+
+    :return     : a tuple of the modification time and the size of the file, or (None, None) if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None, None
+
+    return stat.st_mtime, stat.st_size
+
+
+def get_finished_datasets(connection, config):
+    """
+    Gets the datasets which have already been scored successfully with a job config.
+
+    :param connection : a connection to the results store.
+    :type connection  : sqlite3.Connection
+
+    :param config     : the job config, as a JSON string.
+    :type config      : str
+
+    :return           : a dictionary mapping dataset paths to the (modification time, size) of the file when it was
+                        scored.
+    """
+    rows = connection.execute("SELECT dataset, file_mtime, file_size FROM results WHERE status = ? AND config = ?",
+                              (STATUS_DONE, config))
+
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+
+def _store_result(connection, path, config, fileStamp, result, error):
+    """
+    Writes the result of one job to the results store.
+    """
+    if error is None:
+        row = (path, config) + fileStamp + (STATUS_DONE, json.dumps(result["components"]),
+                                            json.dumps(result["generic"]), json.dumps(result["timings"]), None,
+                                            time.time())
+    else:
+        row = (path, config) + fileStamp + (STATUS_FAILED, None, None, None, error, time.time())
+
+    with connection:
+        connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+
+
+def run_batch(manifestPath, resultsPath, numWorkers=None, textColumn=0, labelColumn=1, hasHeader=False,
+              engine="reference"):
+    """
+    Scores every dataset in a manifest across a pool of processes, and writes the difficulty components, generic
+    statistics and timings of each one to a SQLite results store as soon as it finishes. Datasets which were already
+    scored successfully are skipped, so an interrupted run can be restarted and continues where it left off. Datasets
+    which failed are recorded with their traceback and retried on the next run.
+
+    Results are stored per job config (the columns, header and engine), so a run with a different config scores every
+    dataset again and keeps the earlier results. A dataset is also scored again if its file has changed since it was
+    scored, going by the modification time and size of the file.
+
+    :param manifestPath : the path of the manifest file, see read_manifest.
+    :type manifestPath  : str
+
+    :param resultsPath  : the path of the SQLite results store. It is created if it does not exist.
+    :type resultsPath   : str
+
+    :param numWorkers   : the number of worker processes, default the number of CPUs.
+    :type numWorkers    : int
+
+    :param textColumn   : the index of the column with the text of each item, default 0.
+    :type textColumn    : int
+
+    :param labelColumn  : the index of the column with the label of each item, default 1.
+    :type labelColumn   : int
+
+    :param hasHeader    : whether the first row of each file is a header, default False.
+    :type hasHeader     : bool
+
+    :param engine       : which engine computes the statistics, "reference" or "fast". Default "reference".
+    :type engine        : str
+
+    :return             : a dictionary mapping each dataset scored in this run to its status.
+    """
+    connection = sqlite3.connect(resultsPath)
+    connection.execute(RESULTS_TABLE_SCHEMA)
+
+    jobArgs = {"textColumn": textColumn, "labelColumn": labelColumn, "hasHeader": hasHeader, "engine": engine}
+    config  = json.dumps(jobArgs, sort_keys=True)
+
+    finished   = get_finished_datasets(connection, config)
+    fileStamps = {path: get_file_stamp(path) for path in read_manifest(manifestPath)}
+    pending    = [path for path, fileStamp in fileStamps.items() if finished.get(path) != fileStamp]
+
+    print("----> {} datasets to score, {} already finished.".format(len(pending), len(fileStamps) - len(pending)))
+
+    statuses = {}
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=numWorkers) as executor:
+
+            futures = {executor.submit(_score_dataset_safely, path, **jobArgs): path for path in pending}
+
+            for future in concurrent.futures.as_completed(futures):
+
+                path = futures[future]
+
+                try:
+                    result, error = future.result()
+                except Exception:
+                    # e.g. the worker process was killed
+                    result, error = None, traceback.format_exc()
+
+                _store_result(connection, path, config, fileStamps[path], result, error)
+                statuses[path] = STATUS_DONE if error is None else STATUS_FAILED
+
+                print("----> [{}/{}] {}: {}".format(len(statuses), len(pending), path, statuses[path]))
+
+    finally:
+        connection.close()
+
+    return statuses
+
+
+def main():
+    """
+    Command line entry point: python -m edm.report.batch_runner MANIFEST RESULTS [options]
+    """
+    parser = argparse.ArgumentParser(description="Score a manifest of datasets into a SQLite results store.")
+    parser.add_argument("manifest", help="file listing one dataset .csv file per line")
+    parser.add_argument("results" , help="SQLite results store to create or resume")
+    parser.add_argument("--workers"     , type=int, default=None, help="number of worker processes")
+    parser.add_argument("--text-column" , type=int, default=0   , help="index of the text column")
+    parser.add_argument("--label-column", type=int, default=1   , help="index of the label column")
+    parser.add_argument("--header"      , action="store_true"   , help="the dataset files have a header row")
+    parser.add_argument("--engine"      , default="reference"   , choices=sorted(report_creator.ENGINES))
+
+    args = parser.parse_args()
+
+    run_batch(args.manifest, args.results, args.workers, args.text_column, args.label_column, args.header,
+              args.engine)
+
+
+if __name__ == "__main__":
+    main()
+
+# ======================================================================================================================
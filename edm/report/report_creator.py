@@ -25,6 +25,13 @@ MEASURE_MEANS_AND_SIGMAS = {
     "DIFFICULTY"                  : (3.2590836550130224     , 0.8036059012169776)
 }
 
+# The engines which can compute the statistics. "reference" is the original pure Python implementation and "fast" is
+# the vectorized NumPy implementation. Both modules provide functions of the same names.
+ENGINES = {
+    "reference" : metrics,
+    "fast"      : metrics.vectorized_measures
+}
+
 
 class Color:
     BLUE      = '\033[94m'
@@ -80,7 +87,16 @@ def _compare_to_mean(stat, whichStatistic):
     return severity
 
 
-def get_difficulty_estimate(labelBow, wordCounts, labelCounts):
+def _get_engine(engine):
+    """
+    Gets the module which implements the metrics for the given engine name.
+    """
+    assert engine in ENGINES, "The engine must be one of: {}".format(", ".join(ENGINES))
+
+    return ENGINES[engine]
+
+
+def get_difficulty_estimate(labelBow, wordCounts, labelCounts, engine="reference"):
     """
     Calculates the five statistics proposed as components of our difficulty measure.
 
@@ -94,21 +110,26 @@ def get_difficulty_estimate(labelBow, wordCounts, labelCounts):
     :param labelCounts : a dictionary mapping labels to a count of their occurrences in the data.
     :type labelCounts  : dict
 
+    :param engine      : which engine computes the statistics, "reference" or "fast". Default "reference".
+    :type engine       : str
+
     :return            : a list of tuples with all of the components of the difficulty measure.
     """
-    vocabRatio     = metrics.get_vocab_ratio(wordCounts)
+    engineMetrics  = _get_engine(engine)
+
+    vocabRatio     = engineMetrics.get_vocab_ratio(wordCounts)
     sevVocab       = _compare_to_mean(vocabRatio, "DISTINCT_WORDS__TOTAL_WORDS")
 
-    classImbalance = metrics.get_class_imbalance(labelCounts)
+    classImbalance = engineMetrics.get_class_imbalance(labelCounts)
     sevClassImabl  = _compare_to_mean(classImbalance, "CLASS_IMBAL")
 
-    classDiversity = metrics.get_class_diversity(labelCounts)
+    classDiversity = engineMetrics.get_class_diversity(labelCounts)
     sevClassDiv    = _compare_to_mean(classDiversity, "CLASS_DIVERSITY")
 
-    minHellDist    = 1 - metrics.get_minimum_hellinger_distance(labelBow)
+    minHellDist    = 1 - engineMetrics.get_minimum_hellinger_distance(labelBow)
     sevMinHellDist = _compare_to_mean(minHellDist, "MIN_HELL_DIST")
 
-    minfo          = metrics.get_avg_mutual_information(labelBow)
+    minfo          = engineMetrics.get_avg_mutual_information(labelBow)
     sevMinfo       = _compare_to_mean(minfo, "MUTUAL_INFO")
 
     difficulty     = vocabRatio + classImbalance + classDiversity + minHellDist + minfo
@@ -126,7 +147,56 @@ def get_difficulty_estimate(labelBow, wordCounts, labelCounts):
     return valueList
 
 
-def get_generic_statistics(wordCounts, labelCounts, sentsLens):
+def get_difficulty_intervals(labelBow, labelCounts, numReplicates=200, alpha=0.05, seed=None):
+    """
+    Calculates bootstrap confidence intervals for the five components of our difficulty measure and for the difficulty
+    itself. The severity of an interval is the range of severities between its bounds, e.g. "GOOD - HIGH" if a
+    component could be either.
+
+    :param labelBow      : bag of ngrams in a specific format. Keys are the labels of the dataset, and the values are
+                           bag-of-words dictionaries for the sentences in each class.
+    :type labelBow       : dict
+
+    :param labelCounts   : a dictionary mapping labels to a count of their occurrences in the data.
+    :type labelCounts    : dict
+
+    :param numReplicates : the number of bootstrap replicates, default 200.
+    :type numReplicates  : int
+
+    :param alpha         : the intervals cover 1 - alpha of the replicates, default 0.05.
+    :type alpha          : float
+
+    :param seed          : the random seed, default None.
+    :type seed           : int
+
+    :return              : a list of tuples with each component, its value and interval as a string, and its severity.
+    """
+    intervals = metrics.bootstrap.get_bootstrap_intervals(labelBow, labelCounts, numReplicates, alpha, seed)
+
+    names = [
+        ("Distinct Words : Total Words" , "DISTINCT_WORDS__TOTAL_WORDS"),
+        ("Class Imbalance"              , "CLASS_IMBAL"),
+        ("Class Diversity"              , "CLASS_DIVERSITY"),
+        ("Max. Hellinger Similarity"    , "MIN_HELL_DIST"),
+        ("Mutual Information"           , "MUTUAL_INFO"),
+        ("Difficulty"                   , "DIFFICULTY")
+    ]
+
+    valueList = []
+    for name, statistic in names:
+
+        value, low, high = intervals[statistic]
+
+        sevLow  = _compare_to_mean(low, statistic)
+        sevHigh = _compare_to_mean(high, statistic)
+        sev     = sevLow if sevLow == sevHigh else sevLow + " - " + sevHigh
+
+        valueList.append((name, "{:.4f} [{:.4f}, {:.4f}]".format(value, low, high), sev))
+
+    return valueList
+
+
+def get_generic_statistics(wordCounts, labelCounts, sentsLens, engine="reference"):
     """
     Gets generic dataset statistics such as average sentence length.
 
@@ -136,18 +206,23 @@ def get_generic_statistics(wordCounts, labelCounts, sentsLens):
     :param labelCounts : a dictionary mapping labels to a count of their occurrences in the data.
     :type labelCounts  : dict
 
-    :param sentsLens   : a list of the lengths of sentences.
-    :type sentsLens    : list
+    :param sentsLens   : a list of the lengths of sentences, or streaming sentence length statistics.
+    :type sentsLens    : list or datastructures.SentenceLengthStatistics
+
+    :param engine      : which engine computes the statistics, "reference" or "fast". Default "reference".
+    :type engine       : str
 
     :return            : a dictionary with all of the components of a difficulty measure.
     """
-    vocabSize        = metrics.get_vocab_size(wordCounts)
+    engineMetrics    = _get_engine(engine)
 
-    numClasses       = metrics.get_number_of_classes(labelCounts)
+    vocabSize        = engineMetrics.get_vocab_size(wordCounts)
 
-    meanItemPerClass = metrics.get_mean_data_items_per_class(labelCounts)
+    numClasses       = engineMetrics.get_number_of_classes(labelCounts)
 
-    minItemInClass   = metrics.get_minimum_data_items_in_a_class(labelCounts)
+    meanItemPerClass = engineMetrics.get_mean_data_items_per_class(labelCounts)
+
+    minItemInClass   = engineMetrics.get_minimum_data_items_in_a_class(labelCounts)
 
     if minItemInClass > meanItemPerClass / 2:
         severity = Color.GREEN + "GOOD" + Color.ENDC
@@ -156,20 +231,70 @@ def get_generic_statistics(wordCounts, labelCounts, sentsLens):
     elif minItemInClass < meanItemPerClass / 4:
         severity = Color.RED + "EXTREMELY LOW" + Color.ENDC
 
-    averageSentLen   = metrics.get_average_sentence_length(sentsLens)
+    sentLenDist      = engineMetrics.get_sentence_length_distribution(sentsLens)
 
     valueList = [
-        ("Dataset Size"            , len(sentsLens)   , "-"),
-        ("Vocab Size"              , vocabSize        , "-"),
-        ("Number of Classes"       , numClasses       , "-"),
-        ("Mean Items Per Class"    , meanItemPerClass , "-"),
-        ("Min. Items in a Class"   , minItemInClass   , severity),
-        ("Average Sentence Length" , averageSentLen   , "-")
+        ("Dataset Size"            , len(sentsLens)      , "-"),
+        ("Vocab Size"              , vocabSize           , "-"),
+        ("Number of Classes"       , numClasses          , "-"),
+        ("Mean Items Per Class"    , meanItemPerClass    , "-"),
+        ("Min. Items in a Class"   , minItemInClass      , severity),
+        ("Average Sentence Length" , sentLenDist["MEAN"] , "-"),
+        ("Sentence Length Std."    , sentLenDist["STD"]  , "-"),
+        ("Sentence Length p50"     , sentLenDist["P50"]  , "-"),
+        ("Sentence Length p95"     , sentLenDist["P95"]  , "-"),
+        ("Sentence Length p99"     , sentLenDist["P99"]  , "-")
     ]
 
     return valueList
 
 
+def get_duplicate_statistics(sents, labels, testSents=None, threshold=0.8):
+    """
+    Gets statistics about near-duplicate items in the dataset, found with MinHash signatures and locality sensitive
+    hashing over the tokenized sentences. Near-duplicates with conflicting labels make a dataset harder to learn, and
+    test items which are near-duplicates of training items make it look easier than it is.
+
+    :param sents     : a list of the sentences in the dataset. Each sentence is an untokenized string.
+    :type sents      : list
+
+    :param labels    : a list of the labels in the dataset. There is one label for every sentence.
+    :type labels     : list
+
+    :param testSents : an optional list of the sentences in the test set, to measure train/test overlap.
+    :type testSents  : list
+
+    :param threshold : the minimum estimated Jaccard similarity of near-duplicates, default 0.8.
+    :type threshold  : float
+
+    :return          : a list of tuples with the duplicate statistics of the dataset.
+    """
+    assert len(sents) == len(labels), "The lists of sentences and labels must be the same length"
+
+    signatures    = metrics.near_duplicates.get_minhash_signatures(sents, tokenizer=datastructures.tokenize_sentence)
+
+    clusterIds    = metrics.near_duplicates.get_near_duplicate_clusters(signatures, threshold=threshold)
+
+    _, labelCodes = datastructures.encode_labels(labels)
+
+    valueList = [
+        ("Duplicate Rate"                , metrics.near_duplicates.get_duplicate_rate(clusterIds), "-"),
+        ("Conflicting Label Duplicates"  ,
+         metrics.near_duplicates.get_conflicting_label_duplicate_rate(clusterIds, labelCodes)  , "-")
+    ]
+
+    if testSents is not None:
+
+        testSignatures = metrics.near_duplicates.get_minhash_signatures(testSents,
+                                                                        tokenizer=datastructures.tokenize_sentence)
+
+        overlapRate    = metrics.near_duplicates.get_overlap_rate(signatures, testSignatures, threshold=threshold)
+
+        valueList.append(("Train/Test Overlap", overlapRate, "-"))
+
+    return valueList
+
+
 def generate_report(statsList):
     """
     Generates a string representation of a list of stats.
@@ -212,7 +337,7 @@ def generate_report(statsList):
     return report
 
 
-def get_difficulty_report(sents, labels):
+def get_difficulty_report(sents, labels, engine="reference"):
     """
     Coordinates the creation of a difficulty report for a sentence classification task.
 
@@ -222,18 +347,21 @@ def get_difficulty_report(sents, labels):
     :param labels : a list of the labels in the dataset. There is one label for every sentence.
     :type labels  : list
 
+    :param engine : which engine computes the statistics, "reference" or "fast". Default "reference".
+    :type engine  : str
+
     :return       : a string describing the difficulty of a dataset.
     """
     print("----> Building bag of words representations...")
-    labelBow, wordCounts, labelCounts, sentsLenList = datastructures.get_bags_of_words(sents, labels)
+    labelBow, wordCounts, labelCounts, sentLenStats = datastructures.get_bags_of_words(sents, labels)
     print("----> Done.")
 
     print("----> Getting difficulty metrics...")
-    difficultyAnalysis = get_difficulty_estimate(labelBow, wordCounts, labelCounts)
+    difficultyAnalysis = get_difficulty_estimate(labelBow, wordCounts, labelCounts, engine)
     print("----> Done.")
 
     print("----> Getting generic statistics...")
-    genericStats       = get_generic_statistics(wordCounts, labelCounts, sentsLenList)
+    genericStats       = get_generic_statistics(wordCounts, labelCounts, sentLenStats, engine)
     print("----> Done.")
 
     report = generate_report(genericStats + difficultyAnalysis)
@@ -241,7 +369,39 @@ def get_difficulty_report(sents, labels):
     return report
 
 
-def get_difficulty_components_dict(sents, labels):
+def get_difficulty_interval_report(sents, labels, numReplicates=200, alpha=0.05, seed=None):
+    """
+    Coordinates the creation of a difficulty report with bootstrap confidence intervals for every component.
+
+    :param sents         : a list of the sentences in the dataset. Each sentence is an untokenized string.
+    :type sents          : list
+
+    :param labels        : a list of the labels in the dataset. There is one label for every sentence.
+    :type labels         : list
+
+    :param numReplicates : the number of bootstrap replicates, default 200.
+    :type numReplicates  : int
+
+    :param alpha         : the intervals cover 1 - alpha of the replicates, default 0.05.
+    :type alpha          : float
+
+    :param seed          : the random seed, default None.
+    :type seed           : int
+
+    :return              : a string describing the difficulty of a dataset and its uncertainty.
+    """
+    print("----> Building bag of words representations...")
+    labelBow, _, labelCounts, _ = datastructures.get_bags_of_words(sents, labels)
+    print("----> Done.")
+
+    print("----> Getting difficulty metrics and {} bootstrap replicates...".format(numReplicates))
+    intervalAnalysis = get_difficulty_intervals(labelBow, labelCounts, numReplicates, alpha, seed)
+    print("----> Done.")
+
+    return generate_report(intervalAnalysis)
+
+
+def get_difficulty_components_dict(sents, labels, engine="reference"):
     """
     Coordinates the creation of a difficulty report for a sentence classification task, but returns the results as a
     dictionary rather than a string.
@@ -252,17 +412,86 @@ def get_difficulty_components_dict(sents, labels):
     :param labels : a list of the labels in the dataset. There is one label for every sentence.
     :type labels  : list
 
+    :param engine : which engine computes the statistics, "reference" or "fast". Default "reference".
+    :type engine  : str
+
     :return       : a dictionary of difficulty statistics about the dataset.
     """
 
     print("----> Building bag of words representations...")
-    labelBow, wordCounts, labelCounts, sentsLenList = datastructures.get_bags_of_words(sents, labels)
+    labelBow, wordCounts, labelCounts, sentLenStats = datastructures.get_bags_of_words(sents, labels)
     print("----> Done.")
 
     print("----> Getting difficulty metrics...")
-    difficultyAnalysis = get_difficulty_estimate(labelBow, wordCounts, labelCounts)
+    difficultyAnalysis = get_difficulty_estimate(labelBow, wordCounts, labelCounts, engine)
     print("----> Done.")
 
     return {name : (val, sev) for name, val, sev in difficultyAnalysis}
 
+
+def get_distribution_shift_dict(trainSents, trainLabels, testSents, testLabels):
+    """
+    Measures how different a test split is from a training split, and returns the results as a dictionary. The
+    dictionary has the Hellinger distance between the word distributions of the two splits, the Hellinger distance
+    between the word distributions of each class, the Hellinger distance between the label distributions and the
+    fraction of test words which never occur in the training split.
+
+    :param trainSents  : a list of the sentences in the training split. Each sentence is an untokenized string.
+    :type trainSents   : list
+
+    :param trainLabels : a list of the labels in the training split. There is one label for every sentence.
+    :type trainLabels  : list
+
+    :param testSents   : a list of the sentences in the test split. Each sentence is an untokenized string.
+    :type testSents    : list
+
+    :param testLabels  : a list of the labels in the test split. There is one label for every sentence.
+    :type testLabels   : list
+
+    :return            : a dictionary of distribution shift statistics.
+    """
+    print("----> Building bag of words representations...")
+    trainLabelBow, _, trainLabelCounts, _ = datastructures.get_bags_of_words(trainSents, trainLabels)
+    testLabelBow, _, testLabelCounts, _   = datastructures.get_bags_of_words(testSents, testLabels)
+    print("----> Done.")
+
+    print("----> Getting distribution shift metrics...")
+    shift = metrics.distribution_shift.get_distribution_shift(trainLabelBow, testLabelBow,
+                                                              trainLabelCounts, testLabelCounts)
+    print("----> Done.")
+
+    return shift
+
+
+def get_distribution_shift_report(trainSents, trainLabels, testSents, testLabels):
+    """
+    Coordinates the creation of a report on how different a test split is from a training split.
+
+    :param trainSents  : a list of the sentences in the training split. Each sentence is an untokenized string.
+    :type trainSents   : list
+
+    :param trainLabels : a list of the labels in the training split. There is one label for every sentence.
+    :type trainLabels  : list
+
+    :param testSents   : a list of the sentences in the test split. Each sentence is an untokenized string.
+    :type testSents    : list
+
+    :param testLabels  : a list of the labels in the test split. There is one label for every sentence.
+    :type testLabels   : list
+
+    :return            : a string describing the distribution shift between the splits.
+    """
+    shift = get_distribution_shift_dict(trainSents, trainLabels, testSents, testLabels)
+
+    valueList = [
+        ("Word Distribution Shift"  , shift["GLOBAL_HELL_DIST"] , "-"),
+        ("Label Distribution Shift" , shift["LABEL_HELL_DIST"]  , "-"),
+        ("Test OOV Rate"            , shift["OOV_RATE"]         , "-")
+    ]
+
+    valueList += [("Word Distribution Shift ({})".format(label), dist, "-")
+                  for label, dist in shift["CLASS_HELL_DISTS"].items()]
+
+    return generate_report(valueList)
+
 # ======================================================================================================================
@@ -22,7 +22,7 @@ setup(
 
     # >>>> Requirements <<<<
     install_requires= [
-        "numpy"
+        "numpy>=1.22"
     ],
-    python_requires='~=3.3'
+    python_requires='>=3.9'
 )
@@ -0,0 +1,115 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import csv
+import json
+import random
+
+# >>>> Package Imports <<<<
+import pytest
+
+# ======================================================================================================================
+
+CORPUS_ROWS = [("plain text {}".format(i), "pos" if i % 3 else "neg") for i in range(200)]
+
+# Items which a line-based reader would split in the wrong place
+CORPUS_ROWS[5]  = ("a quoted \"word\", and a comma", "pos")
+CORPUS_ROWS[17] = ("an item over\ntwo lines", "neg")
+CORPUS_ROWS[42] = ("a windows\r\nnewline", "pos")
+
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def make_synthetic_dataset(seed):
+    """
+    Makes a random labelled dataset. Every class draws its words from a Zipf-like distribution over a shared vocabulary
+    which is shuffled differently for each class, and a few stopwords and punctuation marks are mixed in.
+    """
+    rng = random.Random(seed)
+
+    numClasses = rng.randint(2, 8)
+    numItems   = rng.randint(numClasses, 1500)
+    vocabSize  = rng.randint(5, 400)
+
+    vocab      = ["w{}".format(i) for i in range(vocabSize)] + ["the", "a", "is", "of", "and"]
+    weights    = [1 / (rank + 1) for rank in range(len(vocab))]
+    classes    = ["class_{}".format(i) for i in range(numClasses)]
+    classVocab = {label: rng.sample(vocab, len(vocab)) for label in classes}
+
+    # Skew the label distribution so that class imbalance varies between datasets
+    labelWeights = [rng.random() ** 2 + 0.01 for _ in classes]
+
+    sents, labels = [], []
+    for idx in range(numItems):
+
+        # Make sure every class is seen at least once
+        label = classes[idx] if idx < numClasses else rng.choices(classes, labelWeights)[0]
+        words = rng.choices(classVocab[label], weights, k=rng.randint(1, 30))
+
+        sents.append(" ".join(words) + rng.choice(["", ".", "!", " ?"]))
+        labels.append(label)
+
+    return sents, labels
+
+
+def write_corpus(filePath):
+    """
+    Writes CORPUS_ROWS to a corpus file, as JSONL if the file name ends in .jsonl and otherwise as CSV with a header
+    and a few blank lines.
+    """
+    with open(filePath, "w", newline="") as f:
+
+        if filePath.endswith(".jsonl"):
+            for text, label in CORPUS_ROWS:
+                f.write(json.dumps({"text": text, "label": label}) + "\n")
+            return
+
+        writer = csv.writer(f)
+        writer.writerow(["text", "label"])
+        for idx, row in enumerate(CORPUS_ROWS):
+            writer.writerow(row)
+            if idx % 50 == 0:
+                f.write("\n")
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# FIXTURES
+#
+# ======================================================================================================================
+
+
+@pytest.fixture
+def synthetic_dataset():
+    """
+    Makes random labelled datasets, see make_synthetic_dataset.
+    """
+    return make_synthetic_dataset
+
+
+@pytest.fixture
+def corpus_rows():
+    """
+    The items written by write_corpus.
+    """
+    return CORPUS_ROWS
+
+
+@pytest.fixture
+def corpus_writer():
+    """
+    Writes corpus files, see write_corpus.
+    """
+    return write_corpus
+
+# ======================================================================================================================
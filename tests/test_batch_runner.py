@@ -0,0 +1,113 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import os
+import sys
+import csv
+import json
+import sqlite3
+import subprocess
+path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(path + "/..")
+
+# >>>> Package Imports <<<<
+# None
+
+# >>>> This Package Imports <<<<
+from edm.report import batch_runner
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def write_dataset(filePath, dataset):
+    sents, labels = dataset
+
+    with open(filePath, "w", newline="") as f:
+        csv.writer(f).writerows(zip(sents, labels))
+
+
+def get_stored_results(resultsPath):
+    connection = sqlite3.connect(resultsPath)
+    rows       = connection.execute("SELECT dataset, config, status FROM results").fetchall()
+    connection.close()
+
+    return sorted([(os.path.basename(dataset), json.loads(config)["engine"], status)
+                   for dataset, config, status in rows])
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# TESTS
+#
+# ======================================================================================================================
+
+
+def test_run_batch_resumes(tmp_path, synthetic_dataset):
+
+    write_dataset(str(tmp_path / "first.csv"), synthetic_dataset(0))
+    write_dataset(str(tmp_path / "second.csv"), synthetic_dataset(1))
+
+    # Not a dataset file, so this job fails
+    (tmp_path / "broken.csv").write_text("only one column\n")
+
+    manifestPath = str(tmp_path / "manifest.txt")
+    resultsPath  = str(tmp_path / "results.sqlite")
+
+    with open(manifestPath, "w") as f:
+        f.write("# datasets\nfirst.csv\n\nsecond.csv\nbroken.csv\n")
+
+    firstPath, secondPath, brokenPath = [str(tmp_path / name) for name in ("first.csv", "second.csv", "broken.csv")]
+
+    statuses = batch_runner.run_batch(manifestPath, resultsPath, numWorkers=2)
+
+    assert statuses == {firstPath: batch_runner.STATUS_DONE, secondPath: batch_runner.STATUS_DONE,
+                        brokenPath: batch_runner.STATUS_FAILED}
+
+    # Finished datasets are skipped and failed ones are retried
+    assert batch_runner.run_batch(manifestPath, resultsPath, numWorkers=2) == {brokenPath: batch_runner.STATUS_FAILED}
+
+    # A changed file is scored again
+    write_dataset(secondPath, synthetic_dataset(2))
+    os.utime(secondPath, (0, 0))
+
+    assert batch_runner.run_batch(manifestPath, resultsPath, numWorkers=2) == {
+        secondPath: batch_runner.STATUS_DONE, brokenPath: batch_runner.STATUS_FAILED}
+
+    # A different job config scores every dataset again, and keeps the earlier results
+    statuses = batch_runner.run_batch(manifestPath, resultsPath, numWorkers=2, engine="fast")
+
+    assert sorted(statuses) == sorted([firstPath, secondPath, brokenPath])
+    assert get_stored_results(resultsPath) == [("broken.csv", "fast"     , batch_runner.STATUS_FAILED),
+                                               ("broken.csv", "reference", batch_runner.STATUS_FAILED),
+                                               ("first.csv" , "fast"     , batch_runner.STATUS_DONE),
+                                               ("first.csv" , "reference", batch_runner.STATUS_DONE),
+                                               ("second.csv", "fast"     , batch_runner.STATUS_DONE),
+                                               ("second.csv", "reference", batch_runner.STATUS_DONE)]
+
+
+def test_command_line_runs_without_warnings(tmp_path, synthetic_dataset):
+
+    write_dataset(str(tmp_path / "first.csv"), synthetic_dataset(0))
+    (tmp_path / "manifest.txt").write_text("first.csv\n")
+
+    result = subprocess.run([sys.executable, "-W", "error::RuntimeWarning", "-m", "edm.report.batch_runner",
+                             str(tmp_path / "manifest.txt"), str(tmp_path / "results.sqlite"), "--workers", "1"],
+                            cwd=path + "/..", capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stderr == ""
+    assert get_stored_results(str(tmp_path / "results.sqlite")) == [("first.csv", "reference",
+                                                                     batch_runner.STATUS_DONE)]
+
+# ======================================================================================================================
@@ -0,0 +1,109 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import os
+import sys
+path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(path + "/..")
+
+# >>>> Package Imports <<<<
+import numpy as np
+import pytest
+
+# >>>> This Package Imports <<<<
+from edm import datastructures
+from edm.metrics import bootstrap, vectorized_measures
+
+# ======================================================================================================================
+
+
+# ======================================================================================================================
+#
+# TESTS
+#
+# ======================================================================================================================
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_replicate_statistics_match_metrics_on_original_counts(seed, synthetic_dataset):
+
+    sents, labels = synthetic_dataset(seed)
+
+    labelBow, wordCounts, labelCounts, _ = datastructures.get_bags_of_words(sents, labels)
+
+    classes, vocab, countMatrix = vectorized_measures.get_count_matrix(labelBow)
+    isStopword = np.array([word in datastructures.STOPWORDS for word in vocab])
+    wordOrder  = bootstrap._get_word_order(labelBow, classes, vocab)
+    labelCountVector = np.array([[labelCounts[label] for label in classes]])
+
+    diversity, imbalance = bootstrap._get_class_statistic_replicates(labelCountVector)
+
+    assert np.isclose(bootstrap._get_vocab_ratio_replicates(countMatrix[None])[0],
+                      vectorized_measures.get_vocab_ratio(wordCounts))
+    assert np.isclose(diversity[0], vectorized_measures.get_class_diversity(labelCounts))
+    assert np.isclose(imbalance[0], vectorized_measures.get_class_imbalance(labelCounts))
+    assert np.isclose(bootstrap._get_hellinger_similarity_replicates(countMatrix[None])[0],
+                      1 - vectorized_measures.get_minimum_hellinger_distance(labelBow))
+    assert np.isclose(bootstrap._get_mutual_information_replicates(countMatrix[None], isStopword, wordOrder)[0],
+                      vectorized_measures.get_avg_mutual_information(labelBow))
+
+
+def test_hellinger_replicates_of_proportional_classes_are_exact():
+
+    countMatrix = np.array([[3., 1., 4., 1., 5.], [6., 2., 8., 2., 10.], [1., 0., 0., 7., 1.]])
+
+    # The expanded form of the sum cancels to rounding noise, which the square root would blow up
+    assert bootstrap._get_hellinger_similarity_replicates(countMatrix[None])[0] == 1
+
+
+def test_intervals_are_near_point_estimates_and_are_reproducible(synthetic_dataset):
+
+    sents, labels = synthetic_dataset(0)
+
+    labelBow, _, labelCounts, _ = datastructures.get_bags_of_words(sents, labels)
+
+    intervals = bootstrap.get_bootstrap_intervals(labelBow, labelCounts, numReplicates=100, seed=0,
+                                                  maxBatchElements=10 ** 5)
+
+    assert intervals == bootstrap.get_bootstrap_intervals(labelBow, labelCounts, numReplicates=100, seed=0)
+
+    # A bias-shifted percentile interval is not guaranteed to contain the point estimate, only to lie close to it, so
+    # this checks that the point estimate is within one interval width of the interval
+    for name, (value, low, high) in intervals.items():
+        assert low <= high, name
+        assert low - (high - low) <= value <= high + (high - low), name
+
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_class_diversity_intervals_match_the_multinomial_standard_error(seed, synthetic_dataset):
+
+    sents, labels = synthetic_dataset(seed)
+
+    labelBow, _, labelCounts, _ = datastructures.get_bags_of_words(sents, labels)
+
+    # By the delta method, the standard error of the entropy of a multinomial sample of size n is
+    # sqrt((sum(p * log(p) ** 2) - H ** 2) / n), and a 95% interval is about 2 * 1.96 standard errors wide
+    probs    = np.array(list(labelCounts.values())) / sum(labelCounts.values())
+    entropy  = -np.sum(probs * np.log(probs))
+    stdError = np.sqrt((np.sum(probs * np.log(probs) ** 2) - entropy ** 2) / sum(labelCounts.values()))
+
+    _, low, high = bootstrap.get_bootstrap_intervals(labelBow, labelCounts, numReplicates=400,
+                                                     seed=0)["CLASS_DIVERSITY"]
+
+    assert np.isclose(high - low, 2 * 1.96 * stdError, rtol=0.15)
+
+    # With a hundred times the data, the interval is about ten times narrower
+    scaledBow    = {label: {word: 100 * count for word, count in bow.items()} for label, bow in labelBow.items()}
+    scaledCounts = {label: 100 * count for label, count in labelCounts.items()}
+
+    _, scaledLow, scaledHigh = bootstrap.get_bootstrap_intervals(scaledBow, scaledCounts, numReplicates=400,
+                                                                 seed=0)["CLASS_DIVERSITY"]
+
+    assert 8 < (high - low) / (scaledHigh - scaledLow) < 12
+
+# ======================================================================================================================
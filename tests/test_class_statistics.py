@@ -0,0 +1,70 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import os
+import sys
+import random
+path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(path + "/..")
+
+# >>>> Package Imports <<<<
+import numpy as np
+import pytest
+
+# >>>> This Package Imports <<<<
+from edm import datastructures, metrics
+from edm.metrics import difficulty_measures
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# TESTS
+#
+# ======================================================================================================================
+
+
+def test_encode_labels_in_one_pass():
+
+    classes, labelCodes = datastructures.encode_labels(["b", 1, "a", "1", "b", 1])
+
+    # Labels are not converted to strings, so 1 and "1" stay different classes
+    assert classes == ["b", 1, "a", "1"]
+    assert labelCodes.tolist() == [0, 1, 2, 3, 0, 1]
+    assert labelCodes.dtype == np.int64
+
+    assert datastructures.count_label_codes(labelCodes, 6).tolist() == [2, 2, 1, 1, 0, 0]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_class_statistics_match_reference(seed):
+
+    rng    = random.Random(seed)
+    labels = [rng.choice(["class_{}".format(i) for i in range(rng.randint(1, 20))]) for _ in range(500)]
+
+    classes, labelCodes = datastructures.encode_labels(labels)
+    labelCounts         = dict(zip(classes, datastructures.count_label_codes(labelCodes).tolist()))
+
+    # Classes with a count of zero, e.g. from count_label_codes with a larger numClasses, are ignored
+    labelCountVector = datastructures.count_label_codes(labelCodes, len(classes) + 3)
+    classStats       = metrics.get_class_statistics(labelCountVector)
+
+    assert np.isclose(classStats["CLASS_DIVERSITY"], difficulty_measures.get_class_diversity(labelCounts))
+    assert np.isclose(classStats["CLASS_IMBAL"], difficulty_measures.get_class_imbalance(labelCounts))
+    assert np.isclose(classStats["MEAN_ITEMS_PER_CLASS"],
+                      difficulty_measures.get_mean_data_items_per_class(labelCounts))
+
+    assert classStats["NUM_CLASSES"]          == difficulty_measures.get_number_of_classes(labelCounts)
+    assert classStats["MIN_ITEMS_IN_A_CLASS"] == difficulty_measures.get_minimum_data_items_in_a_class(labelCounts)
+
+
+def test_class_statistics_need_a_non_zero_count():
+
+    with pytest.raises(AssertionError):
+        metrics.get_class_statistics(np.zeros(3, dtype=np.int64))
+
+# ======================================================================================================================
@@ -0,0 +1,163 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import os
+import io
+import sys
+import csv
+import pickle
+import random
+path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(path + "/..")
+
+# >>>> Package Imports <<<<
+import numpy as np
+import pytest
+
+# >>>> This Package Imports <<<<
+from edm import datastructures
+from edm.datastructures import corpus_index
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def make_messy_csv(seed, numRows=300):
+    """
+    Makes the text of a CSV file whose fields mix quoted fields (with commas, newlines and escaped quotes inside)
+    and unquoted fields with literal quotes in them, as csv.reader accepts.
+    """
+    rng = random.Random(seed)
+
+    lines = []
+    for _ in range(numRows):
+
+        fields = []
+        for _ in range(rng.randint(1, 4)):
+
+            if rng.random() < 0.5:
+                text = "".join(rng.choice(["a", " ", ",", '"', "\n", "\r\n"]) for _ in range(rng.randint(0, 8)))
+                fields.append('"' + text.replace('"', '""') + '"')
+            else:
+                text = "".join(rng.choice(["b", " ", '"']) for _ in range(rng.randint(0, 8)))
+                fields.append("b" + text)
+
+        lines.append(",".join(fields))
+
+    return "\n".join(lines) + "\n"
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# TESTS
+#
+# ======================================================================================================================
+
+
+@pytest.mark.parametrize("fileName, hasHeader", [("corpus.csv", True), ("corpus.jsonl", False)])
+def test_corpus_index_reads_every_record(tmp_path, monkeypatch, corpus_writer, corpus_rows, fileName, hasHeader):
+
+    # Small chunks make sure records which cross a chunk boundary are found
+    monkeypatch.setattr(corpus_index, "SCAN_CHUNK_SIZE", 37)
+
+    filePath = str(tmp_path / fileName)
+    corpus_writer(filePath)
+
+    with datastructures.CorpusIndex(filePath, hasHeader=hasHeader) as index:
+
+        assert len(index) == len(corpus_rows)
+        assert index.get_items() == ([text for text, _ in corpus_rows], [label for _, label in corpus_rows])
+        assert index.get_items(15, 45) == ([text for text, _ in corpus_rows[15:45]],
+                                           [label for _, label in corpus_rows[15:45]])
+        assert index.get_items_at([42, 17, 5]) == ([corpus_rows[42][0], corpus_rows[17][0], corpus_rows[5][0]],
+                                                   [corpus_rows[42][1], corpus_rows[17][1], corpus_rows[5][1]])
+
+        shards = [index.get_shard(shardIdx, 7) for shardIdx in range(7)]
+        assert sum([shardSents for shardSents, _ in shards], []) == [text for text, _ in corpus_rows]
+
+        sampleSents, sampleLabels = index.get_sample(20, seed=0)
+        assert len(set(sampleSents)) == 20
+        assert set(zip(sampleSents, sampleLabels)) <= set(corpus_rows)
+
+        unpickled = pickle.loads(pickle.dumps(index))
+        assert unpickled.get_items(100, 110) == index.get_items(100, 110)
+        unpickled.close()
+
+        indexPath = str(tmp_path / "index.npy")
+        index.save_index(indexPath)
+
+        with datastructures.CorpusIndex.load(filePath, indexPath) as loaded:
+            assert loaded.get_items(0, 50) == index.get_items(0, 50)
+
+
+def test_saved_index_is_memory_mapped_and_not_pickled(tmp_path, corpus_writer):
+
+    filePath = str(tmp_path / "corpus.csv")
+    corpus_writer(filePath)
+
+    with datastructures.CorpusIndex(filePath, hasHeader=True) as index:
+
+        pickledSize = len(pickle.dumps(index))
+
+        # No .npy extension, to check the index is saved to exactly this path
+        indexPath = str(tmp_path / "corpus.index")
+        index.save_index(indexPath)
+
+        assert len(pickle.dumps(index)) < pickledSize - index.offsets.nbytes
+
+        with datastructures.CorpusIndex.load(filePath, indexPath) as loaded:
+
+            assert isinstance(loaded.offsets, np.memmap)
+
+            unpickled = pickle.loads(pickle.dumps(loaded))
+            assert isinstance(unpickled.offsets, np.memmap)
+            assert unpickled.get_items() == index.get_items()
+            unpickled.close()
+
+
+
+def test_literal_quotes_in_unquoted_fields(tmp_path):
+
+    filePath = str(tmp_path / "corpus.csv")
+
+    with open(filePath, "w", newline="") as f:
+        f.write('a 5" screen,pos\nsecond item,neg\nthird item,pos\n')
+
+    with datastructures.CorpusIndex(filePath) as index:
+
+        assert len(index) == 3
+        assert index.get_items() == (['a 5" screen', "second item", "third item"], ["pos", "neg", "pos"])
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("chunkSize", [1, 7, 1024])
+def test_records_match_csv_reader(tmp_path, monkeypatch, seed, chunkSize):
+
+    monkeypatch.setattr(corpus_index, "SCAN_CHUNK_SIZE", chunkSize)
+
+    text     = make_messy_csv(seed)
+    filePath = str(tmp_path / "corpus.csv")
+
+    with open(filePath, "w", newline="") as f:
+        f.write(text)
+
+    expected = [row for row in csv.reader(io.StringIO(text, newline="")) if row]
+
+    with datastructures.CorpusIndex(filePath) as index:
+
+        assert len(index) == len(expected)
+
+        for idx, row in enumerate(expected):
+            assert list(csv.reader(io.StringIO(bytes(index.get_record_bytes(idx)).decode(), newline=""))) == [row]
+
+# ======================================================================================================================
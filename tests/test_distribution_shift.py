@@ -0,0 +1,150 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import os
+import sys
+import warnings
+path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(path + "/..")
+
+# >>>> Package Imports <<<<
+import numpy as np
+
+# >>>> This Package Imports <<<<
+from edm import datastructures, report
+from edm.metrics import distribution_shift, vectorized_measures
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def get_shift(trainSents, trainLabels, testSents, testLabels):
+    """
+    Gets the distribution shift statistics of two splits straight from the metrics module.
+    """
+    trainLabelBow, _, trainLabelCounts, _ = datastructures.get_bags_of_words(trainSents, trainLabels, verbose=False)
+    testLabelBow, _, testLabelCounts, _   = datastructures.get_bags_of_words(testSents, testLabels, verbose=False)
+
+    return distribution_shift.get_distribution_shift(trainLabelBow, testLabelBow, trainLabelCounts, testLabelCounts)
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# TESTS
+#
+# ======================================================================================================================
+
+
+def test_identical_splits_have_no_shift(synthetic_dataset):
+
+    sents, labels = synthetic_dataset(0)
+
+    shift = get_shift(sents, labels, sents[::-1], labels[::-1])
+
+    assert np.isclose(shift["GLOBAL_HELL_DIST"], 0)
+    assert np.isclose(shift["LABEL_HELL_DIST"], 0)
+    assert shift["OOV_RATE"] == 0
+
+    assert set(shift["CLASS_HELL_DISTS"]) == set(labels)
+    assert np.allclose(list(shift["CLASS_HELL_DISTS"].values()), 0)
+
+
+def test_disjoint_vocabularies_are_fully_shifted():
+
+    shift = get_shift(["good film", "bad film"], ["pos", "neg"], ["great plot", "awful plot"], ["pos", "neg"])
+
+    assert np.isclose(shift["GLOBAL_HELL_DIST"], 1)
+    assert shift["OOV_RATE"] == 1
+    assert np.allclose(list(shift["CLASS_HELL_DISTS"].values()), 1)
+
+    # Neither split has any label the other does not
+    assert np.isclose(shift["LABEL_HELL_DIST"], 0)
+
+
+def test_classes_in_one_split_are_left_out():
+
+    shift = get_shift(["good film", "bad film", "meh film"], ["pos", "neg", "neutral"],
+                      ["good film", "bad plot", "what plot"], ["pos", "neg", "question"])
+
+    assert set(shift["CLASS_HELL_DISTS"]) == {"pos", "neg"}
+    assert np.isclose(shift["CLASS_HELL_DISTS"]["pos"], 0)
+
+    # "bad film" against "bad plot": 1 / sqrt(2) * sqrt(2 * (sqrt(1 / 2) - 0) ** 2) = sqrt(1 / 2)
+    assert np.isclose(shift["CLASS_HELL_DISTS"]["neg"], np.sqrt(0.5))
+
+    # "what" and "plot" are not in the training split, and "plot" appears twice in the test split
+    assert np.isclose(shift["OOV_RATE"], 3 / 6)
+
+
+def test_label_distribution_shift():
+
+    # p = (1 / 4, 3 / 4) and q = (3 / 4, 1 / 4), so the distance is |sqrt(3 / 4) - sqrt(1 / 4)|
+    assert np.isclose(distribution_shift.get_label_distribution_shift({"a": 1, "b": 3}, {"a": 3, "b": 1}),
+                      np.sqrt(0.75) - 0.5)
+
+    assert np.isclose(distribution_shift.get_label_distribution_shift({"a": 5}, {"b": 2}), 1)
+    assert np.isclose(distribution_shift.get_label_distribution_shift({"a": 2, "b": 2}, {"b": 7, "a": 7}), 0)
+
+    # A label missing from one split: p = (1 / 2, 1 / 2, 0) and q = (1 / 3, 1 / 3, 1 / 3)
+    expected = np.sqrt(0.5 * (2 * (np.sqrt(1 / 2) - np.sqrt(1 / 3)) ** 2 + 1 / 3))
+
+    assert np.isclose(distribution_shift.get_label_distribution_shift({"a": 1, "b": 1}, {"a": 1, "b": 1, "c": 1}),
+                      expected)
+
+
+def test_chunked_distances_match_unchunked(monkeypatch, synthetic_dataset):
+
+    trainSents, trainLabels = synthetic_dataset(3)
+    testSents, testLabels   = synthetic_dataset(4)
+
+    shift = get_shift(trainSents, trainLabels, testSents, testLabels)
+
+    # Chunks of a single row
+    monkeypatch.setattr(vectorized_measures, "MAX_CHUNK_ELEMENTS", 1)
+    chunkedShift = get_shift(trainSents, trainLabels, testSents, testLabels)
+
+    assert np.isclose(chunkedShift["GLOBAL_HELL_DIST"], shift["GLOBAL_HELL_DIST"])
+
+    for label, distance in shift["CLASS_HELL_DISTS"].items():
+        assert np.isclose(chunkedShift["CLASS_HELL_DISTS"][label], distance)
+
+
+def test_out_of_vocabulary_rate_without_words():
+
+    countMatrix = np.array([[1.0, 2.0], [0.0, 3.0]])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+
+        assert distribution_shift.get_out_of_vocabulary_rate(countMatrix, np.zeros_like(countMatrix)) == 0
+
+
+def test_distribution_shift_report(synthetic_dataset):
+
+    trainSents, trainLabels = synthetic_dataset(1)
+    testSents, testLabels   = synthetic_dataset(2)
+
+    shiftDict = report.get_distribution_shift_dict(trainSents, trainLabels, testSents, testLabels)
+
+    assert shiftDict == get_shift(trainSents, trainLabels, testSents, testLabels)
+    assert 0 < shiftDict["GLOBAL_HELL_DIST"] < 1
+
+    shiftReport = report.get_distribution_shift_report(trainSents, trainLabels, testSents, testLabels)
+
+    assert "Word Distribution Shift" in shiftReport
+    assert "Test OOV Rate" in shiftReport
+
+    for label in shiftDict["CLASS_HELL_DISTS"]:
+        assert "Word Distribution Shift ({})".format(label) in shiftReport
+
+# ======================================================================================================================
@@ -0,0 +1,238 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import os
+import sys
+import random
+path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(path + "/..")
+
+# >>>> Package Imports <<<<
+import numpy as np
+import pytest
+
+# >>>> This Package Imports <<<<
+from edm import datastructures
+from edm.metrics import difficulty_measures, vectorized_measures
+from edm.report import report_creator
+
+# ======================================================================================================================
+
+RELATIVE_TOLERANCE = 1e-9
+ABSOLUTE_TOLERANCE = 1e-12
+
+NUM_RANDOM_DATASETS = 25
+
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def assert_engines_agree(referenceStats, fastStats):
+    """
+    Asserts that two lists of (name, value, severity) tuples agree on every name and value.
+    """
+    assert [name for name, _, _ in referenceStats] == [name for name, _, _ in fastStats]
+
+    for (name, refValue, refSev), (_, fastValue, fastSev) in zip(referenceStats, fastStats):
+
+        assert np.isclose(refValue, fastValue, rtol=RELATIVE_TOLERANCE, atol=ABSOLUTE_TOLERANCE), \
+            "{}: reference {} != fast {}".format(name, refValue, fastValue)
+
+        assert refSev == fastSev, "{}: reference severity {} != fast severity {}".format(name, refSev, fastSev)
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# TESTS
+#
+# ======================================================================================================================
+
+
+@pytest.mark.parametrize("seed", range(NUM_RANDOM_DATASETS))
+def test_difficulty_estimate_engines_agree(seed, synthetic_dataset):
+
+    sents, labels = synthetic_dataset(seed)
+
+    labelBow, wordCounts, labelCounts, _ = datastructures.get_bags_of_words(sents, labels)
+
+    assert_engines_agree(report_creator.get_difficulty_estimate(labelBow, wordCounts, labelCounts, "reference"),
+                         report_creator.get_difficulty_estimate(labelBow, wordCounts, labelCounts, "fast"))
+
+
+@pytest.mark.parametrize("seed", range(NUM_RANDOM_DATASETS))
+def test_generic_statistics_engines_agree(seed, synthetic_dataset):
+
+    sents, labels = synthetic_dataset(seed)
+
+    _, wordCounts, labelCounts, sentLenStats = datastructures.get_bags_of_words(sents, labels)
+
+    assert_engines_agree(report_creator.get_generic_statistics(wordCounts, labelCounts, sentLenStats, "reference"),
+                         report_creator.get_generic_statistics(wordCounts, labelCounts, sentLenStats, "fast"))
+
+    # Lists of lengths are summarised exactly by both engines, including lists longer than the sketch's k
+    sentLens = [len(sent) for sent in sents]
+
+    assert_engines_agree(report_creator.get_generic_statistics(wordCounts, labelCounts, sentLens, "reference"),
+                         report_creator.get_generic_statistics(wordCounts, labelCounts, sentLens, "fast"))
+
+
+def test_components_dict_engines_agree(synthetic_dataset):
+
+    sents, labels = synthetic_dataset(NUM_RANDOM_DATASETS)
+
+    referenceDict = report_creator.get_difficulty_components_dict(sents, labels, engine="reference")
+    fastDict      = report_creator.get_difficulty_components_dict(sents, labels, engine="fast")
+
+    assert referenceDict.keys() == fastDict.keys()
+
+    for name, (refValue, _) in referenceDict.items():
+        assert np.isclose(refValue, fastDict[name][0], rtol=RELATIVE_TOLERANCE, atol=ABSOLUTE_TOLERANCE)
+
+
+def test_engines_agree_when_a_class_has_only_stopwords():
+
+    sents  = ["the a is of", "and the", "good film", "great film", "bad film", "awful plot"]
+    labels = ["stop", "stop", "pos", "pos", "neg", "neg"]
+
+    for order in (labels, labels[::-1]):
+
+        sentsInOrder = sents if order is labels else sents[::-1]
+
+        labelBow, wordCounts, labelCounts, _ = datastructures.get_bags_of_words(sentsInOrder, order)
+
+        assert_engines_agree(report_creator.get_difficulty_estimate(labelBow, wordCounts, labelCounts, "reference"),
+                             report_creator.get_difficulty_estimate(labelBow, wordCounts, labelCounts, "fast"))
+
+
+@pytest.mark.parametrize("maxChunkElements", [vectorized_measures.MAX_CHUNK_ELEMENTS, 1000])
+def test_engines_agree_with_many_classes(monkeypatch, maxChunkElements):
+
+    # Small chunks make sure the pairwise statistics are the same when the classes are split into many chunks
+    monkeypatch.setattr(vectorized_measures, "MAX_CHUNK_ELEMENTS", maxChunkElements)
+
+    rng   = random.Random(0)
+    vocab = ["w{}".format(i) for i in range(2000)] + ["the", "a", "is"]
+
+    sents, labels = [], []
+    for idx in range(320 * 4):
+        sents.append(" ".join(rng.choices(vocab, k=rng.randint(1, 25))))
+        labels.append("class_{}".format(idx % 320))
+
+    labelBow, wordCounts, labelCounts, _ = datastructures.get_bags_of_words(sents, labels, verbose=False)
+
+    assert_engines_agree(report_creator.get_difficulty_estimate(labelBow, wordCounts, labelCounts, "reference"),
+                         report_creator.get_difficulty_estimate(labelBow, wordCounts, labelCounts, "fast"))
+
+
+def test_engines_agree_on_proportional_classes(synthetic_dataset):
+
+    # Class b is class a doubled, so the expanded form of the Hellinger sum cancels to rounding noise
+    sents, labels = synthetic_dataset(0)
+    labelBow, wordCounts, labelCounts, _ = datastructures.get_bags_of_words(sents, labels)
+
+    classA   = dict(next(iter(labelBow.values())))
+    labelBow = dict(labelBow, b_doubled={word: 2 * count for word, count in classA.items()})
+
+    assert difficulty_measures.get_minimum_hellinger_distance(labelBow) == 0
+    assert vectorized_measures.get_minimum_hellinger_distance(labelBow) == 0
+
+    # Nearly identical classes
+    labelBow["b_doubled"] = dict(classA, extra=1)
+
+    assert np.isclose(difficulty_measures.get_minimum_hellinger_distance(labelBow),
+                      vectorized_measures.get_minimum_hellinger_distance(labelBow),
+                      rtol=RELATIVE_TOLERANCE, atol=ABSOLUTE_TOLERANCE)
+
+    labelCounts = dict(labelCounts, b_doubled=1)
+
+    assert_engines_agree(report_creator.get_difficulty_estimate(labelBow, wordCounts, labelCounts, "reference"),
+                         report_creator.get_difficulty_estimate(labelBow, wordCounts, labelCounts, "fast"))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_explanations_agree_with_metrics(seed, synthetic_dataset):
+
+    sents, labels = synthetic_dataset(seed)
+
+    labelBow, _, _, _ = datastructures.get_bags_of_words(sents, labels)
+
+    for engineMetrics in (difficulty_measures, vectorized_measures):
+
+        minHellDist, hellExplanation = engineMetrics.get_minimum_hellinger_distance(labelBow, explain=True, topK=10**6)
+        avgMutualInfo, miExplanation = engineMetrics.get_avg_mutual_information(labelBow, explain=True, topK=10**6)
+
+        assert minHellDist   == engineMetrics.get_minimum_hellinger_distance(labelBow)
+        assert avgMutualInfo == engineMetrics.get_avg_mutual_information(labelBow)
+
+        # With every word included, the contributions add up to the metrics
+        label1, label2 = hellExplanation["classes"]
+        distinguishing = sum([value for _, value in hellExplanation["distinguishing_words"]])
+
+        assert np.isclose(np.sqrt(distinguishing / 2), minHellDist)
+        assert np.isclose(difficulty_measures._get_hellinger_distance(labelBow[label1], labelBow[label2]), minHellDist)
+
+        cellSums = {cell: sum([value for _, value in words]) for cell, words in miExplanation.items()}
+        offDiag  = sum([value for (label1, label2), value in cellSums.items() if label1 != label2])
+        diag     = sum([value for (label1, label2), value in cellSums.items() if label1 == label2])
+
+        assert np.isclose((2 * offDiag + diag) / len(labelBow) ** 2, avgMutualInfo)
+
+    _, explanation = vectorized_measures.get_minimum_hellinger_distance(labelBow, explain=True, topK=3)
+
+    assert len(explanation["distinguishing_words"]) == 3
+    assert explanation["distinguishing_words"][0][1] >= explanation["distinguishing_words"][-1][1]
+
+
+def test_reference_explanation_uses_the_closest_pair():
+
+    # Every pair is at the same distance, so the explained pair must be the one the reference distance came from
+    labelBow = {"a": {"x": 1, "y": 1}, "b": {"y": 1, "z": 1}, "c": {"z": 1, "x": 1}}
+
+    minHellDist, explanation = difficulty_measures.get_minimum_hellinger_distance(labelBow, explain=True)
+
+    assert explanation["classes"] == ("a", "b")
+    assert difficulty_measures._get_hellinger_distance(labelBow["a"], labelBow["b"]) == minHellDist
+    assert explanation["shared_words"] == [("y", 0.5)]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_explanations_engines_agree(seed, synthetic_dataset):
+
+    sents, labels = synthetic_dataset(seed)
+
+    labelBow, _, _, _ = datastructures.get_bags_of_words(sents, labels)
+
+    for getMetric in ("get_minimum_hellinger_distance", "get_avg_mutual_information"):
+
+        _, refExplanation  = getattr(difficulty_measures, getMetric)(labelBow, explain=True, topK=10**6)
+        _, fastExplanation = getattr(vectorized_measures, getMetric)(labelBow, explain=True, topK=10**6)
+
+        assert refExplanation.keys() == fastExplanation.keys()
+
+        for key, refWords in refExplanation.items():
+
+            if key == "classes":
+                assert refWords == fastExplanation[key]
+                continue
+
+            fastWords = dict(fastExplanation[key])
+
+            assert dict(refWords).keys() == fastWords.keys()
+            assert all([np.isclose(value, fastWords[word]) for word, value in refWords])
+
+
+def test_unknown_engine_is_rejected():
+
+    with pytest.raises(AssertionError):
+        report_creator.get_difficulty_estimate({}, {}, {}, "unknown")
+
+# ======================================================================================================================
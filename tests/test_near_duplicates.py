@@ -0,0 +1,177 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import os
+import sys
+import random
+import collections
+path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(path + "/..")
+
+# >>>> Package Imports <<<<
+import numpy as np
+
+# >>>> This Package Imports <<<<
+from edm import datastructures, report
+from edm.metrics import near_duplicates
+
+# ======================================================================================================================
+
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def make_sentences(numSents, seed):
+    """
+    Makes random sentences which are very unlikely to be near-duplicates of each other.
+    """
+    rng   = random.Random(seed)
+    vocab = ["w{}".format(i) for i in range(2000)]
+
+    return [" ".join(rng.choices(vocab, k=12)) for _ in range(numSents)]
+
+
+def get_signatures(sents):
+    return near_duplicates.get_minhash_signatures(sents, tokenizer=datastructures.tokenize_sentence)
+
+
+def substitute_words(sent, numWords, rng):
+    """
+    Replaces numWords words of a sentence, no two of them next to each other, with words outside the vocabulary.
+    """
+    words = sent.split()
+    for idx in rng.sample(range(0, len(words), 2), numWords):
+        words[idx] = "x{}".format(rng.randint(0, 10 ** 9))
+
+    return " ".join(words)
+
+
+def get_exact_clusters(sents, threshold):
+    """
+    Gets the partition of the sentences into the connected components of pairs whose exact Jaccard similarity of
+    shingles is at least the threshold, as a set of frozensets of item indices.
+    """
+    shingles = [near_duplicates._get_shingles(datastructures.tokenize_sentence(sent), 2) for sent in sents]
+    parents  = list(range(len(sents)))
+
+    def find(idx):
+        while parents[idx] != idx:
+            idx = parents[idx]
+        return idx
+
+    for idx in range(len(sents)):
+        for jdx in range(idx + 1, len(sents)):
+            if len(shingles[idx] & shingles[jdx]) / len(shingles[idx] | shingles[jdx]) >= threshold:
+                parents[find(jdx)] = find(idx)
+
+    clusters = collections.defaultdict(set)
+    for idx in range(len(sents)):
+        clusters[find(idx)].add(idx)
+
+    return {frozenset(cluster) for cluster in clusters.values()}
+
+
+def to_partition(clusterIds):
+    clusters = collections.defaultdict(set)
+    for idx, clusterId in enumerate(clusterIds.tolist()):
+        clusters[clusterId].add(idx)
+
+    return {frozenset(cluster) for cluster in clusters.values()}
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# TESTS
+#
+# ======================================================================================================================
+
+
+def test_signature_agreement_estimates_jaccard_similarity():
+
+    words1 = ["w{}".format(i) for i in range(100)]
+    words2 = words1[:60] + ["x{}".format(i) for i in range(40)]
+
+    signatures = near_duplicates.get_minhash_signatures([words1, words2], numPerm=1024, shingleSize=1)
+
+    # Jaccard similarity of the word sets is 60 / 140
+    assert abs((signatures[0] == signatures[1]).mean() - 60 / 140) < 0.05
+
+
+def test_exact_and_near_duplicates_are_clustered():
+
+    sents = make_sentences(500, seed=0)
+    sents = sents + sents[:50] + [sent.upper() + "!" for sent in sents[50:100]]
+
+    clusterIds = near_duplicates.get_near_duplicate_clusters(get_signatures(sents))
+
+    assert near_duplicates.get_duplicate_rate(clusterIds) == 100 / 600
+    assert np.array_equal(clusterIds[500:600], clusterIds[:100])
+
+
+def test_substituted_words_match_exact_jaccard_clustering():
+
+    rng   = random.Random(0)
+    vocab = ["w{}".format(i) for i in range(2000)]
+    sents = [" ".join(rng.choices(vocab, k=80)) for _ in range(150)]
+
+    # With 80 words and shingles of 2 words, one substitution leaves a Jaccard similarity of at least 77 / 81 and two
+    # of at least 75 / 83, both above the threshold, while thirty leave a similarity far below it
+    sents += [substitute_words(sent, 1, rng) for sent in sents[:40]]
+    sents += [substitute_words(sent, 2, rng) for sent in sents[40:80]]
+    sents += [substitute_words(sent, 30, rng) for sent in sents[80:100]]
+
+    clusterIds = near_duplicates.get_near_duplicate_clusters(get_signatures(sents), threshold=0.8)
+
+    assert to_partition(clusterIds) == get_exact_clusters(sents, threshold=0.8)
+    assert near_duplicates.get_duplicate_rate(clusterIds) == 80 / len(sents)
+
+
+def test_duplicate_statistics_report():
+
+    train  = make_sentences(300, seed=3)
+    labels = ["pos" if idx % 2 else "neg" for idx in range(len(train))]
+
+    # 20 exact duplicates, half of them with the other label
+    train  = train + train[:20]
+    labels = labels + [label if idx % 2 else ("neg" if label == "pos" else "pos")
+                       for idx, label in enumerate(labels[:20])]
+    test   = train[:30] + make_sentences(70, seed=4)
+
+    stats = report.get_duplicate_statistics(train, labels, testSents=test)
+
+    assert [name for name, _, _ in stats] == ["Duplicate Rate", "Conflicting Label Duplicates", "Train/Test Overlap"]
+    assert stats[0][1] == 20 / 320
+    assert stats[1][1] == 20 / 320
+    assert stats[2][1] == 30 / 100
+
+    assert len(report.get_duplicate_statistics(train, labels)) == 2
+
+
+def test_conflicting_labels_are_counted_per_item():
+
+    sents  = ["good film", "good film", "good film", "bad film", "awful plot"]
+    labels = ["pos", "pos", "neg", "neg", "neg"]
+
+    clusterIds    = near_duplicates.get_near_duplicate_clusters(get_signatures(sents))
+    _, labelCodes = datastructures.encode_labels(labels)
+
+    assert near_duplicates.get_conflicting_label_duplicate_rate(clusterIds, labelCodes) == 3 / 5
+
+
+def test_train_test_overlap():
+
+    train = make_sentences(1000, seed=1)
+    test  = train[:100] + make_sentences(300, seed=2)
+
+    assert near_duplicates.get_overlap_rate(get_signatures(train), get_signatures(test)) == 100 / 400
+
+# ======================================================================================================================
@@ -0,0 +1,131 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import os
+import sys
+import subprocess
+import multiprocessing
+path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(path + "/..")
+
+# >>>> Package Imports <<<<
+import pytest
+
+# >>>> This Package Imports <<<<
+from edm import datastructures
+from edm.datastructures import pipeline
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# TESTS
+#
+# ======================================================================================================================
+
+
+@pytest.mark.parametrize("fileName, hasHeader, numWorkers", [("corpus.csv", True, 0), ("corpus.csv", True, 2),
+                                                             ("corpus.jsonl", False, 0)])
+def test_pipeline_matches_get_bags_of_words(tmp_path, corpus_writer, corpus_rows, fileName, hasHeader, numWorkers):
+
+    filePath = str(tmp_path / fileName)
+    corpus_writer(filePath)
+
+    expected = datastructures.get_bags_of_words([text for text, _ in corpus_rows], [label for _, label in corpus_rows],
+                                                verbose=False)
+
+    # Tiny blocks and batches make sure records which cross a block boundary, and records longer than a block, are
+    # read correctly, and that the queues fill up
+    labelBow, bow, labelCount, sentLenStats = datastructures.get_bags_of_words_from_file(
+        filePath, hasHeader=hasHeader, batchSize=7, blockSize=16, queueSize=2, numWorkers=numWorkers, verbose=False)
+
+    # Insertion order matters to the metrics, so the dictionaries are compared as lists
+    assert [(label, list(wordCounts.items())) for label, wordCounts in labelBow.items()] == \
+        [(label, list(wordCounts.items())) for label, wordCounts in expected[0].items()]
+    assert list(bow.items())        == list(expected[1].items())
+    assert list(labelCount.items()) == list(expected[2].items())
+
+    assert sentLenStats.count == expected[3].count
+    assert sentLenStats.total == expected[3].total
+
+
+def test_long_records_are_scanned_once(tmp_path, monkeypatch):
+
+    filePath = str(tmp_path / "corpus.csv")
+
+    with open(filePath, "w", newline="") as f:
+        f.write('"{}",pos\n"a ""quoted""\nword",neg\n'.format("word " * 5000))
+
+    scannedBytes = []
+    findRecordEnds = pipeline._find_record_ends
+
+    def find_record_ends(data, *args):
+        scannedBytes.append(data.size)
+        return findRecordEnds(data, *args)
+
+    monkeypatch.setattr(pipeline, "_find_record_ends", find_record_ends)
+
+    labelBow, _, labelCount, _ = datastructures.get_bags_of_words_from_file(filePath, blockSize=64, numWorkers=0,
+                                                                            verbose=False)
+
+    # A record hundreds of blocks long is not scanned again with every block
+    assert sum(scannedBytes) == os.path.getsize(filePath)
+    assert dict(labelCount) == {"pos": 1, "neg": 1}
+    assert dict(labelBow["neg"]) == {"a": 1, "quoted": 1, "word": 1}
+
+
+def test_pipeline_raises_stage_errors(tmp_path):
+
+    filePath = str(tmp_path / "corpus.jsonl")
+
+    with open(filePath, "w") as f:
+        f.write('{"text": "fine", "label": "pos"}\nnot json\n')
+
+    with pytest.raises(ValueError):
+        datastructures.get_bags_of_words_from_file(filePath, numWorkers=0, verbose=False)
+
+
+
+@pytest.mark.parametrize("blockSize", [1, 5, 1024])
+def test_literal_quotes_in_unquoted_fields(tmp_path, blockSize):
+
+    filePath = str(tmp_path / "corpus.csv")
+
+    with open(filePath, "w", newline="") as f:
+        f.write('a 5" screen,pos\nsecond item,neg\n"third, ""quoted"" item",pos\n')
+
+    _, bow, labelCount, _ = datastructures.get_bags_of_words_from_file(filePath, blockSize=blockSize, numWorkers=0,
+                                                                       verbose=False)
+
+    assert dict(labelCount) == {"pos": 2, "neg": 1}
+    assert bow["screen"] == 1 and bow["third"] == 1 and bow["quoted"] == 1
+
+
+
+@pytest.mark.skipif(sys.platform == "darwin" or "fork" not in multiprocessing.get_all_start_methods(),
+                    reason="The workers are spawned, so the calling script must be guarded")
+def test_unguarded_script_with_workers(tmp_path):
+
+    filePath = str(tmp_path / "corpus.csv")
+
+    with open(filePath, "w", newline="") as f:
+        f.write("good film,pos\nbad film,neg\ngood plot,pos\n")
+
+    # Spawned workers would import the script again, and start a pipeline of their own
+    (tmp_path / "script.py").write_text(
+        "from edm import datastructures\n"
+        "_, _, labelCount, _ = datastructures.get_bags_of_words_from_file({!r}, batchSize=1, numWorkers=2,\n"
+        "                                                                 verbose=False)\n"
+        "print(sorted(labelCount.items()))\n".format(filePath))
+
+    result = subprocess.run([sys.executable, str(tmp_path / "script.py")], cwd=path + "/..", capture_output=True,
+                            text=True, timeout=60, env=dict(os.environ, PYTHONPATH=path + "/.."))
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[('neg', 1), ('pos', 2)]"
+
+# ======================================================================================================================
@@ -0,0 +1,143 @@
+# ======================================================================================================================
+#
+# IMPORT STATEMENTS
+#
+# ======================================================================================================================
+
+# >>>> Python Native Imports <<<<
+import os
+import sys
+path = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(path + "/..")
+
+# >>>> Package Imports <<<<
+import numpy as np
+import pytest
+
+# >>>> This Package Imports <<<<
+from edm import datastructures
+
+# ======================================================================================================================
+
+K = 200
+
+# The rank error bound documented in QuantileSketch, as a fraction of the number of items
+RANK_ERROR = 1.65 / K
+
+QUANTILES = np.linspace(0.01, 0.99, 99)
+
+
+# ======================================================================================================================
+#
+# FUNCTIONS
+#
+# ======================================================================================================================
+
+
+def get_rank_error(sketch, sortedValues):
+    """
+    Gets the largest distance, as a fraction of the number of values, between the rank of the estimate of a quantile
+    and the rank of the quantile, over QUANTILES.
+    """
+    worstError = 0
+
+    for q in QUANTILES:
+
+        estimate   = sketch.quantile(q)
+        targetRank = q * sortedValues.size
+        lowRank    = np.searchsorted(sortedValues, estimate, side="left")
+        highRank   = np.searchsorted(sortedValues, estimate, side="right")
+        error      = 0 if lowRank <= targetRank <= highRank else min(abs(lowRank - targetRank),
+                                                                      abs(highRank - targetRank))
+
+        worstError = max(worstError, error / sortedValues.size)
+
+    return worstError
+
+
+def make_stats(lengths, numShards=1):
+    """
+    Builds SentenceLengthStatistics from numShards shards of the lengths, merged together.
+    """
+    shards = [datastructures.SentenceLengthStatistics.from_lengths(shard.tolist(), K, seed)
+              for seed, shard in enumerate(np.array_split(lengths, numShards))]
+
+    for shard in shards[1:]:
+        shards[0].merge(shard)
+
+    return shards[0]
+
+# ======================================================================================================================
+
+# ======================================================================================================================
+#
+# TESTS
+#
+# ======================================================================================================================
+
+
+def test_sketch_is_exact_below_k():
+
+    values = np.random.default_rng(0).integers(0, 1000, size=K - 1)
+    sketch = datastructures.QuantileSketch(K)
+
+    for value in values.tolist():
+        sketch.update(value)
+
+    for q in QUANTILES:
+        assert sketch.quantile(q) == np.quantile(values, q, method="inverted_cdf")
+
+
+@pytest.mark.parametrize("numShards", [1, 7])
+def test_rank_error_is_within_bound(numShards):
+
+    lengths = np.random.default_rng(numShards).lognormal(3, 1, size=100000)
+    stats   = make_stats(lengths, numShards)
+
+    assert stats.sketch.count == lengths.size
+    assert get_rank_error(stats.sketch, np.sort(lengths)) <= RANK_ERROR
+
+    # Memory is bounded however many values are added
+    assert stats.sketch.size <= 3 * K + 10
+
+
+def test_merged_shards_match_a_single_stream():
+
+    lengths = np.random.default_rng(1).integers(1, 500, size=50000)
+
+    single = make_stats(lengths)
+    merged = make_stats(lengths, numShards=13)
+
+    assert merged.count == single.count == lengths.size
+    assert merged.total == single.total == lengths.sum()
+    assert np.isclose(merged.std, single.std)
+
+    # Below k the merged sketch is exact, like a single one
+    small = make_stats(lengths[:K - 1], numShards=4)
+
+    for q in QUANTILES:
+        assert small.quantile(q) == np.quantile(lengths[:K - 1], q, method="inverted_cdf")
+
+
+@pytest.mark.parametrize("numShards", [1, 5])
+def test_moments_match_numpy(numShards):
+
+    lengths = np.random.default_rng(2).integers(1, 10 ** 6, size=20000)
+    stats   = make_stats(lengths, numShards)
+
+    assert len(stats) == lengths.size
+    assert np.isclose(stats.mean, lengths.mean(), rtol=1e-15)
+    assert np.isclose(stats.std, lengths.std(), rtol=1e-12)
+
+
+def test_statistics_are_reproducible():
+
+    sents  = ["x" * length for length in np.random.default_rng(3).integers(1, 300, size=5000).tolist()]
+    labels = ["pos"] * len(sents)
+
+    first  = datastructures.get_bags_of_words(sents, labels, verbose=False)[3]
+    second = datastructures.get_bags_of_words(sents, labels, verbose=False)[3]
+
+    assert [first.quantile(q) for q in QUANTILES] == [second.quantile(q) for q in QUANTILES]
+
+# ======================================================================================================================